@@ -1,8 +1,14 @@
 from functools import wraps
 from inspect import signature
-from typing import Callable
+from typing import Callable, Optional
 
-from jinja2 import StrictUndefined, Template
+from jinja2 import Environment, StrictUndefined, Template
+
+# Prompts are plain text, so there is nothing to escape, and their templates
+# come from docstrings rather than files, so there is nothing to reload.
+_environment = Environment(
+    undefined=StrictUndefined, autoescape=False, auto_reload=False
+)
 
 
 def prompt(func: Callable) -> Callable[..., str]:
@@ -40,13 +46,17 @@ def prompt(func: Callable) -> Callable[..., str]:
     ```
     """
 
+    sig = signature(func)
+    template: Optional[Template] = None
+
     @wraps(func)
     def wrapper(*args, **kwargs) -> str:
-        docstring = func.__doc__ or ""
-        template = Template(docstring, undefined=StrictUndefined)
+        # Compile the docstring once, on first use
+        nonlocal template
+        if template is None:
+            template = _environment.from_string(func.__doc__ or "")
 
-        # Get function signature and bind arguments
-        sig = signature(func)
+        # Bind arguments to the function signature
         bound_args = sig.bind(*args, **kwargs)
         bound_args.apply_defaults()
 
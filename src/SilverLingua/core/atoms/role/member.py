@@ -5,6 +5,11 @@ class RoleMember:
     """
     Used in ChatRole and ReactRole.
 
+    Two members are equal when they share the same parent enum and name, so
+    `OpenAIChatRole.SYSTEM.value == ChatRole.SYSTEM.value` holds even though they
+    are distinct objects. `Notion.chat_role` always returns a canonical
+    `ChatRole` member, which can be compared with `is`.
+
     Warning:
         **Do not** instantiate this class directly. See [ChatRole][silverlingua.core.atoms.role.chat.ChatRole] and [ReactRole][silverlingua.core.atoms.role.react.ReactRole] for more information.
     """
@@ -29,10 +34,10 @@ class RoleMember:
         raise ImmutableAttributeError("RoleMember attributes are immutable.")
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             isinstance(other, RoleMember)
-            and other._parent == self._parent
-            and other.name == self.name
+            and other._parent is self._parent
+            and other._name == self._name
         )  # type: ignore
 
     def __str__(self):
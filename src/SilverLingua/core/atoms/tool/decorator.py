@@ -24,7 +24,7 @@ class ToolWrapper:
         return getattr(self._tool, name)
 
     def __str__(self) -> str:
-        return self._tool.model_dump_json()
+        return str(self._tool)
 
 
 def tool(func: Callable) -> ToolWrapper:
@@ -1,8 +1,9 @@
 import json
-from typing import Callable
+from typing import Callable, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from ....util import json_dumps, json_loads
 from .util import (
     FunctionJSONSchema,
     ToolCallFunction,
@@ -55,17 +56,19 @@ class Tool(BaseModel):
     function: Callable = Field(exclude=True)
     description: FunctionJSONSchema = Field(validate_default=True)
     name: str = Field(validate_default=True)
+    _json: Optional[str] = PrivateAttr(default=None)
 
     def use_function_call(self, function_call: ToolCallFunction):
         """
         Uses a FunctionCall to call the function.
         """
         arguments_dict = function_call.arguments
-        if arguments_dict == "":
-            return json.dumps(self.function())
+        if arguments_dict == "" or arguments_dict == "{}":
+            # No arguments, so there's nothing to parse.
+            return json_dumps(self.function())
 
         try:
-            arguments_dict = json.loads(function_call.arguments)
+            arguments_dict = json_loads(function_call.arguments)
         except json.JSONDecodeError:
             raise ValueError(
                 "ToolCall.arguments must be a JSON string.\n"
@@ -73,15 +76,23 @@ class Tool(BaseModel):
                 + f"json.loads result: {arguments_dict}"
             ) from None
 
-        return json.dumps(self.function(**arguments_dict))
+        return json_dumps(self.function(**arguments_dict))
 
     def __call__(self, *args, **kwargs):
         if len(args) == 1 and isinstance(args[0], ToolCallFunction):
             return self.use_function_call(args[0])
-        return json.dumps(self.function(*args, **kwargs))
+        return json_dumps(self.function(*args, **kwargs))
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._json = None
 
     def __str__(self) -> str:
-        return self.model_dump_json()
+        # The description rarely changes, so serialize it once.
+        if self._json is None:
+            self._json = self.model_dump_json()
+        return self._json
 
     def __init__(self, function: Callable):
         """
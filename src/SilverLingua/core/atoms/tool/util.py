@@ -1,13 +1,36 @@
+import copy
 import inspect
 import logging
 import re
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from functools import lru_cache
+from types import UnionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
 from uuid import uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    field_validator,
+)
 
 logger = logging.getLogger(__name__)
 
+# Matches an indented "name: description" line in a docstring's Args section.
+_ARG_RE = re.compile(r"^\s+(?P<name>\w+):\s(?P<desc>.*)")
+
 
 class ToolCallResponse(BaseModel):
     """
@@ -20,7 +43,8 @@ class ToolCallResponse(BaseModel):
 
     @classmethod
     def from_tool_call(cls, tool_call: "ToolCall", response: str) -> "ToolCallResponse":
-        return cls(
+        # The tool call is already validated, so skip re-validating its fields.
+        return cls.model_construct(
             tool_call_id=tool_call.id,
             name=tool_call.function.name,
             content=response,
@@ -61,61 +85,54 @@ class ToolCall(BaseModel):
         using UUID, but the older ID likely was generated
         by an API and thus this newer ID is not the true ID.
         """
-        merged_function = {
-            "name": self.function.name or other.function.name,
-            "arguments": (self.function.arguments or "")
+        # Both sides are already validated, so skip re-validation on the
+        # streaming hot path.
+        merged_function = ToolCallFunction.model_construct(
+            name=self.function.name or other.function.name,
+            arguments=(self.function.arguments or "")
             + (other.function.arguments or ""),
-        }
-        merged_function = ToolCallFunction(**merged_function)
+        )
 
         self_extra = self.__pydantic_extra__
         other_extra = other.__pydantic_extra__
 
         index = self.index if self.index is not None else other.index
 
-        # Compare the two extra fields
-        if self_extra != other_extra:
-            if not self_extra or not other_extra:
-                return ToolCall(
-                    id=(self.id) or other.id,
-                    function=merged_function,
-                    index=index,
-                    **(self_extra or {}),
-                    **(other_extra or {}),
-                )
-            # If they are different, merge them
-            merged_extra = {}
-            for key in set(self_extra.keys()) | set(other_extra.keys()):
-                if key in self_extra and key in other_extra:
-                    # If one is None, use the other
-                    # Else, concatenate them
-                    if self_extra[key] == other_extra[key]:
-                        merged_extra[key] = self_extra[key]
-                    else:
-                        if self_extra[key] is None or other_extra[key] is None:
-                            merged_extra[key] = self_extra[key] or other_extra[key]
-                        else:
-                            merged_extra[key] = self_extra[key] + other_extra[key]
-                elif key in self_extra:
-                    merged_extra[key] = self_extra[key]
-                elif key in other_extra:
-                    merged_extra[key] = other_extra[key]
-            #
-            return ToolCall(
+        # Stream chunks from the same provider usually carry identical extras
+        if self_extra is other_extra or self_extra == other_extra:
+            return ToolCall.model_construct(
                 id=self.id or other.id,
                 function=merged_function,
                 index=index,
-                **merged_extra,
+                **(self_extra or {}),
             )
 
-        return ToolCall(
+        # Otherwise merge them: if one side is None, use the other,
+        # else concatenate them
+        merged_extra = dict(self_extra or {})
+        for key, value in (other_extra or {}).items():
+            if key not in merged_extra:
+                merged_extra[key] = value
+                continue
+            existing = merged_extra[key]
+            if existing == value:
+                continue
+            if existing is None or value is None:
+                merged_extra[key] = existing or value
+            else:
+                merged_extra[key] = existing + value
+
+        return ToolCall.model_construct(
             id=self.id or other.id,
             function=merged_function,
             index=index,
-            **(self_extra or {}),
+            **merged_extra,
         )
 
 
+_TOOL_CALL_LIST = TypeAdapter(List[ToolCall])
+
+
 class ToolCalls(BaseModel):
     """
     A list of tool calls.
@@ -123,24 +140,74 @@ class ToolCalls(BaseModel):
 
     list: List[ToolCall] = Field(default_factory=list, frozen=True)
 
+    # Lookups from id / index to position in `list`, maintained by `extend`.
+    _by_id: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _by_index: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _indexed: int = PrivateAttr(default=0)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "ToolCalls":
+        """
+        Parses a JSON array of tool calls, such as the content of a
+        ChatRole.TOOL_CALL Notion.
+        """
+        return cls.model_construct(list=_TOOL_CALL_LIST.validate_json(data))
+
+    def to_json(self) -> str:
+        """
+        Serializes the tool calls to a JSON array, the inverse of `from_json`.
+        Fields that are None are left out.
+        """
+        return _TOOL_CALL_LIST.dump_json(self.list, exclude_none=True).decode()
+
+    def _index(self, i: int) -> None:
+        tool_call = self.list[i]
+        self._by_id.setdefault(tool_call.id, i)
+        if tool_call.index is not None:
+            self._by_index.setdefault(tool_call.index, i)
+
+    def _append_or_merge(self, tool_call: ToolCall) -> None:
+        i = self._by_id.get(tool_call.id)
+        if i is None and tool_call.index is not None:
+            i = self._by_index.get(tool_call.index)
+
+        if i is None:
+            i = len(self.list)
+            self.list.append(tool_call)
+        else:
+            self.list[i] = self.list[i].concat(tool_call)
+        self._index(i)
+        self._indexed = len(self.list)
+
+    def extend(self, other: "ToolCalls") -> None:
+        """
+        Merges the tool calls of `other` into this list in place.
+
+        A tool call in `other` is merged into the existing call with the same
+        `id`, or failing that the same (non-None) `index`; otherwise it is
+        appended. This is what stream consumers should use to accumulate
+        chunks, since it doesn't copy the list per chunk.
+        """
+        if self._indexed != len(self.list):
+            # The list was changed from outside, so rebuild the lookups.
+            self._by_id.clear()
+            self._by_index.clear()
+            for i in range(len(self.list)):
+                self._index(i)
+            self._indexed = len(self.list)
+
+        for tool_call in other.list:
+            self._append_or_merge(tool_call)
+
     def concat(self, other: "ToolCalls") -> "ToolCalls":
         """
         Concatenates two tool calls lists and returns the result.
+
+        See `extend` for how tool calls are matched.
         """
-        new: List[ToolCall] = self.list.copy()
-        for tool_call in other.list:
-            found = False
-            # Find the tool call with the same ID
-            for i, self_tool_call in enumerate(new):
-                if (
-                    self_tool_call.id == tool_call.id
-                    or self_tool_call.index == tool_call.index
-                ):
-                    new[i] = self_tool_call.concat(tool_call)
-                    found = True
-            if not found:
-                new.append(tool_call)
-        return ToolCalls(list=new)
+        new = ToolCalls.model_construct(list=self.list.copy())
+        new.extend(other)
+        return new
 
 
 class Parameter(BaseModel):
@@ -222,53 +289,63 @@ class FunctionJSONSchema(BaseModel):
 ##########################################################################################
 # Global Functions
 ##########################################################################################
+_SIMPLE_TYPE_MAPPING: Dict[Any, str] = {
+    int: "integer",
+    float: "number",
+    str: "string",
+    bool: "boolean",
+    type(None): "null",
+}
+
+
 def python_type_to_json_schema_type(python_type: Type[Any]) -> Union[str, Dict]:
     """
     Maps Python types to JSON Schema types.
 
+    Results are cached per type, and each call gets its own copy of the schema.
+
     Args:
       python_type: The Python type.
 
     Returns:
       Union[str, Dict]: The corresponding JSON Schema type or schema.
     """
-    simple_type_mapping = {
-        int: "integer",
-        float: "number",
-        str: "string",
-        bool: "boolean",
-        type(None): "null",
-    }
+    try:
+        hash(python_type)
+    except TypeError:
+        return _type_to_json_schema(python_type)
+    # Copy so that callers can't change the schema cached for everyone.
+    return copy.deepcopy(_cached_type_to_json_schema(python_type))
+
+
+@lru_cache(maxsize=512)
+def _cached_type_to_json_schema(python_type: Type[Any]) -> Union[str, Dict]:
+    return _type_to_json_schema(python_type)
 
-    if python_type in simple_type_mapping:
-        return simple_type_mapping[python_type]
 
-    if hasattr(python_type, "__origin__"):
-        origin = python_type.__origin__  # type: ignore
+def _type_to_json_schema(python_type: Type[Any]) -> Union[str, Dict]:
+    if python_type in _SIMPLE_TYPE_MAPPING:
+        return _SIMPLE_TYPE_MAPPING[python_type]
 
-        if origin is Union:
-            types = python_type.__args__  # type: ignore
-            if type(None) in types:
-                # This is equivalent to Optional[T]
-                types = [t for t in types if t is not type(None)]
-                if len(types) == 1:
-                    return python_type_to_json_schema_type(types[0])
+    origin = get_origin(python_type)
+    if origin is not None:
+        args = get_args(python_type)
+
+        if (origin is Union or origin is UnionType) and type(None) in args:
+            # This is equivalent to Optional[T]
+            types = [t for t in args if t is not type(None)]
+            if len(types) == 1:
+                return python_type_to_json_schema_type(types[0])
 
         if origin is list:
-            item_type = (
-                python_type.__args__[0] if python_type.__args__ else Any
-            )  # type: ignore
+            item_type = args[0] if args else Any
             return {
                 "type": "array",
                 "items": {"type": python_type_to_json_schema_type(item_type)},
             }
         elif origin is dict:
-            key_type = (
-                python_type.__args__[0] if python_type.__args__ else Any
-            )  # type: ignore
-            value_type = (
-                python_type.__args__[1] if python_type.__args__ else Any
-            )  # type: ignore
+            key_type = args[0] if args else Any
+            value_type = args[1] if args else Any
             if key_type is not str:
                 raise ValueError(
                     "Dictionary key type must be str for conversion to JSON schema"
@@ -305,6 +382,9 @@ def generate_function_json(func: Callable[..., Any]) -> FunctionJSONSchema:
     """
     Generates a FunctionJSONSchema from a python function.
 
+    The schema only depends on the function itself, so it is built once per
+    function and each call gets its own copy.
+
     Example:
     ```python
     def roll_dice(sides: int = 20,
@@ -368,6 +448,21 @@ def generate_function_json(func: Callable[..., Any]) -> FunctionJSONSchema:
     }
     ```
     """
+    try:
+        hash(func)
+    except TypeError:
+        # Unhashable callables can't be cached, so build the schema every time.
+        return _build_function_json(func)
+    # Copy so that Tools wrapping the same function don't share a schema.
+    return _cached_function_json(func).model_copy(deep=True)
+
+
+@lru_cache(maxsize=512)
+def _cached_function_json(func: Callable[..., Any]) -> FunctionJSONSchema:
+    return _build_function_json(func)
+
+
+def _build_function_json(func: Callable[..., Any]) -> FunctionJSONSchema:
     sig = inspect.signature(func)
     doc = inspect.getdoc(func)
 
@@ -389,7 +484,10 @@ def generate_function_json(func: Callable[..., Any]) -> FunctionJSONSchema:
             if capturing_description:
                 description += "\n" + line
             elif start_capturing:
-                match = re.match(r"^\s+(?P<name>\w+):\s(?P<desc>.*)", line)
+                if line and not line[0].isspace():
+                    # An unindented line ends the Args section (e.g. "Returns:").
+                    break
+                match = _ARG_RE.match(line)
                 if match:
                     args_docs[match.group("name")] = match.group("desc")
 
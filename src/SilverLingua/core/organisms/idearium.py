@@ -1,5 +1,5 @@
 import logging
-from typing import Iterator, List, Union
+from typing import Iterator, List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -27,13 +27,16 @@ class Idearium(BaseModel):
         tokenizer: Tokenizer,
         max_tokens: int,
         notions: List[Notion] = None,
+        tokenized_notions: Optional[List[List[int]]] = None,
         **kwargs,
     ):
         # Initialize with empty notions if None
         notions = notions or []
 
-        # Initialize tokenized_notions
-        tokenized_notions = [tokenizer.encode(notion.content) for notion in notions]
+        # Initialize tokenized_notions, unless the caller already has them
+        if tokenized_notions is None:
+            encode = tokenizer.encode
+            tokenized_notions = [encode(notion.content) for notion in notions]
 
         # Call parent init with all values
         super().__init__(
@@ -46,22 +49,63 @@ class Idearium(BaseModel):
 
     @model_validator(mode="after")
     def validate_notions(cls, values):
-        notions = values.notions
-        for notion in notions:
-            cls.validate_notion(notion, values.max_tokens, values.tokenizer)
+        for notion, tokenized_notion in zip(
+            values.notions, values.tokenized_notions, strict=True
+        ):
+            cls.validate_notion(
+                notion, values.max_tokens, values.tokenizer, tokenized_notion
+            )
         return values
 
     @classmethod
-    def validate_notion(cls, notion: Notion, max_tokens: int, tokenizer: Tokenizer):
+    def validate_notion(
+        cls,
+        notion: Notion,
+        max_tokens: int,
+        tokenizer: Tokenizer,
+        tokenized_notion: Optional[List[int]] = None,
+    ):
         if len(notion.content) == 0:
             raise ValueError("Notion content cannot be empty.")
 
-        tokenized_notion = tokenizer.encode(notion.content)
+        if tokenized_notion is None:
+            tokenized_notion = tokenizer.encode(notion.content)
         if len(tokenized_notion) > max_tokens:
             raise ValueError("Notion exceeds maximum token length")
 
         return tokenized_notion
 
+    @classmethod
+    def from_list(
+        cls,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+        notions: List[Notion],
+        prior: Optional["Idearium"] = None,
+    ) -> "Idearium":
+        """
+        Creates an Idearium from a list of notions, reusing the tokenization of
+        `prior` for the leading notions the two have in common.
+
+        This is meant for callers that pass the whole conversation as a list on
+        every turn, so that only the newly added notions need to be tokenized.
+        """
+        tokenized_notions: List[List[int]] = []
+        if prior is not None and prior.tokenizer is tokenizer:
+            for notion, prior_notion, tokenized_notion in zip(
+                notions, prior.notions, prior.tokenized_notions, strict=False
+            ):
+                if notion != prior_notion:
+                    break
+                tokenized_notions.append(tokenized_notion)
+
+        encode = tokenizer.encode
+        tokenized_notions.extend(
+            encode(notion.content) for notion in notions[len(tokenized_notions) :]
+        )
+
+        return cls(tokenizer, max_tokens, notions, tokenized_notions=tokenized_notions)
+
     @property
     def total_tokens(self) -> int:
         """The total number of tokens in the Idearium."""
@@ -78,11 +122,10 @@ class Idearium(BaseModel):
 
     def append(self, notion: Notion):
         """Appends the given notion to the end of the Idearium."""
-        logger.debug(f"Appending notion: {notion.content!r}")
-        tokenized_notion = self.tokenizer.encode(notion.content)
+        logger.debug("Appending notion: %r", notion.content)
 
         if self.notions:
-            logger.debug(f"Current last notion: {self.notions[-1].content!r}")
+            logger.debug("Current last notion: %r", self.notions[-1].content)
 
         if (
             self.notions
@@ -97,11 +140,13 @@ class Idearium(BaseModel):
             )
             self.replace(len(self.notions) - 1, combined_notion)
             logger.debug(
-                f"After replace, about to return combined content: {combined_content!r}"
+                "After replace, about to return combined content: %r", combined_content
             )
             return
 
-        logger.debug(f"Hitting append path. Appending new notion: {notion.content!r}")
+        logger.debug("Hitting append path. Appending new notion: %r", notion.content)
+        # Only encoded here, as merged notions are re-encoded whole by replace.
+        tokenized_notion = self.tokenizer.encode(notion.content)
         self.notions.append(notion)
         self.tokenized_notions.append(tokenized_notion)
 
@@ -185,38 +230,65 @@ class Idearium(BaseModel):
         This is the primary point of extension for Idearium subclasses, as it
         allows for custom trimming behavior.
         """
-        while self.total_tokens > self.max_tokens:
-            non_persistent_indices = self._non_persistent_indices
-
-            # Check if there's only one non-persistent user message
-            if len(non_persistent_indices) == 1:
-                single_index = next(iter(non_persistent_indices))
-                tokenized_notion = self.tokenized_notions[single_index]
-
-                # Trim the only non-persistent notion to fit within the token limit
-                tokenized_notion = tokenized_notion[
-                    : self.max_tokens - (self.total_tokens - len(tokenized_notion))
-                ]
-                trimmed_content = self.tokenizer.decode(tokenized_notion)
-                trimmed_notion = Notion(
-                    content=trimmed_content,
-                    role=self.notions[single_index].role,
-                    persistent=self.notions[single_index].persistent,
-                )
-                self.replace(single_index, trimmed_notion)
-                return
-
-            # Attempt to remove the first non-persistent notion
-            for i in non_persistent_indices:
-                self.pop(i)
+        total_tokens = self.total_tokens
+        if total_tokens <= self.max_tokens:
+            return
+
+        non_persistent_indices = sorted(self._non_persistent_indices)
+        if not non_persistent_indices:
+            # If all notions are persistent and
+            # the max token length is still exceeded
+            raise ValueError(
+                "Persistent notions exceed max_tokens."
+                + " Reduce the content or increase max_tokens."
+            )
+
+        # Remove the oldest non-persistent notions in a single pass until the
+        # rest fit, always keeping the newest one so it can be trimmed instead.
+        removed = set()
+        for i in non_persistent_indices[:-1]:
+            removed.add(i)
+            total_tokens -= len(self.tokenized_notions[i])
+            if total_tokens <= self.max_tokens:
                 break
-            else:
-                # If all notions are persistent and
-                # the max token length is still exceeded
-                raise ValueError(
-                    "Persistent notions exceed max_tokens."
-                    + " Reduce the content or increase max_tokens."
-                )
+        if removed:
+            self._remove_indices(removed)
+
+        if total_tokens <= self.max_tokens:
+            return
+
+        # Trim the only non-persistent notion left to fit within the token limit
+        single_index = non_persistent_indices[-1] - len(removed)
+        tokenized_notion = self.tokenized_notions[single_index]
+        budget = self.max_tokens - (total_tokens - len(tokenized_notion))
+        if budget < 0:
+            raise ValueError(
+                "Persistent notions exceed max_tokens."
+                + " Reduce the content or increase max_tokens."
+            )
+
+        trimmed_content = self.tokenizer.decode(tokenized_notion[:budget])
+        trimmed_notion = Notion(
+            content=trimmed_content,
+            role=self.notions[single_index].role,
+            persistent=self.notions[single_index].persistent,
+        )
+        self.replace(single_index, trimmed_notion)
+
+    def _remove_indices(self, indices: set):
+        """Removes the notions at the given indices in a single pass."""
+        kept = [i for i in range(len(self.notions)) if i not in indices]
+        persistent_indices = {
+            new_index
+            for new_index, old_index in enumerate(kept)
+            if old_index in self.persistent_indices
+        }
+
+        # Modify the containers in place instead of reassigning
+        self.notions[:] = [self.notions[i] for i in kept]
+        self.tokenized_notions[:] = [self.tokenized_notions[i] for i in kept]
+        self.persistent_indices.clear()
+        self.persistent_indices.update(persistent_indices)
 
     def __len__(self) -> int:
         return len(self.notions)
@@ -2,11 +2,12 @@ import asyncio
 import contextlib
 import json
 import logging
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
 
-from ..atoms import ChatRole, Tool, ToolCallResponse, ToolCalls
+from ...util import json_dumps, json_loads
+from ..atoms import ChatRole, Tool, ToolCall, ToolCallResponse, ToolCalls
 from ..molecules import Notion
 from ..organisms import Idearium
 from ..templates.model import Messages, Model
@@ -14,6 +15,44 @@ from ..templates.model import Messages, Model
 logger = logging.getLogger(__name__)
 
 
+def _notifies(name: str):
+    """
+    Wraps the list method `name` to call `_on_change` after it runs.
+    """
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self._on_change is not None:
+            self._on_change()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+class _ToolList(list):
+    """
+    The list of an Agent's tools, which tells the agent whenever it changes
+    so that its tool lookup and model binding stay current.
+    """
+
+    _on_change: Optional[Callable[[], None]] = None
+
+    append = _notifies("append")
+    extend = _notifies("extend")
+    insert = _notifies("insert")
+    remove = _notifies("remove")
+    pop = _notifies("pop")
+    clear = _notifies("clear")
+    sort = _notifies("sort")
+    reverse = _notifies("reverse")
+    __setitem__ = _notifies("__setitem__")
+    __delitem__ = _notifies("__delitem__")
+    __iadd__ = _notifies("__iadd__")
+    __imul__ = _notifies("__imul__")
+
+
 class Agent(BaseModel):
     """
     A wrapper around a [`Model`][silverlingua.core.templates.model.Model] that utilizes an [`Idearium`][silverlingua.core.organisms.idearium.Idearium] and a set of [`Tool`][silverlingua.core.atoms.tool.tool.Tool]s.
@@ -24,12 +63,16 @@ class Agent(BaseModel):
     However, there is limited boilerplate. The only thing that needs to be
     redefined in subclasses is the `_bind_tools` method.
 
-    Additionally, the `_use_tools` method is a common method to redefine.
+    Additionally, the `_use_tool` method (used by both `_use_tools` and
+    `_ause_tools`) is a common method to redefine.
     """
 
     model_config = ConfigDict(frozen=True)
     #
     model: Model
+    """
+    The model used by the agent.
+    """
     idearium: Idearium
     """
     The Idearium used by the agent.
@@ -38,15 +81,21 @@ class Agent(BaseModel):
     """
     The tools used by the agent.
 
-    Warning:
-        **Do not** modify this list directly. Use `add_tool`, `add_tools`,
-        and `remove_tool` instead.
+    Changing this list in place, e.g. `agent.tools.append(tool)`, updates the
+    agent the same way `add_tool`, `add_tools` and `remove_tool` do.
     """
     auto_append_response: bool = True
     """
     Whether to automatically append the response to the idearium after
     generating a response.
     """
+    max_tool_concurrency: int = 5
+    """
+    The maximum number of tools run at once when responding to
+    several tool calls asynchronously.
+    """
+    _tool_index: Dict[str, Tool] = PrivateAttr(default_factory=dict)
+    _tool_response_role: str = PrivateAttr(default="")
 
     def __init__(
         self,
@@ -54,6 +103,7 @@ class Agent(BaseModel):
         idearium: Optional[Idearium] = None,
         tools: Optional[List[Tool]] = None,
         auto_append_response: bool = True,
+        max_tool_concurrency: int = 5,
     ):
         """
         Initializes the agent.
@@ -63,6 +113,10 @@ class Agent(BaseModel):
             idearium (Idearium, optional): The idearium to use.
                 If None, a new one will be created.
             tools (List[Tool], optional): The tools to use.
+            auto_append_response (bool, optional): Whether to append responses
+                to the idearium.
+            max_tool_concurrency (int, optional): The maximum number of tools
+                run at once by `agenerate` and `astream`.
         """
         super().__init__(
             model=model,
@@ -70,17 +124,19 @@ class Agent(BaseModel):
             or Idearium(tokenizer=model.tokenizer, max_tokens=model.max_tokens),
             tools=tools or [],
             auto_append_response=auto_append_response,
+            max_tool_concurrency=max_tool_concurrency,
         )
 
-    def model_post_init(self, __content):
-        self._bind_tools()
+    @field_validator("tools", mode="after")
+    @classmethod
+    def _wrap_tools(cls, tools: List[Tool]) -> _ToolList:
+        return _ToolList(tools)
 
-    @property
-    def model(self) -> Model:
-        """
-        The model used by the agent.
-        """
-        return self.model
+    def model_post_init(self, __content):
+        # The model is frozen, so its tool response role never changes
+        self._tool_response_role = str(self.role.TOOL_RESPONSE.value)
+        self.tools._on_change = self._tools_changed
+        self._tools_changed()
 
     @property
     def role(self) -> ChatRole:
@@ -89,14 +145,65 @@ class Agent(BaseModel):
         """
         return self.model.role
 
+    def _index_tools(self) -> None:
+        """
+        Rebuilds the name lookup used by `_find_tool`.
+        """
+        index: Dict[str, Tool] = {}
+        for t in self.tools:
+            # Keep the first tool with a given name, as a linear search would
+            index.setdefault(t.name, t)
+        self._tool_index = index
+
+    def _tools_changed(self) -> None:
+        """
+        Called whenever `tools` changes, to reindex and rebind the tools.
+        """
+        self._index_tools()
+        self._bind_tools()
+
     def _find_tool(self, name: str) -> Tool | None:
         """
         Finds a tool by name.
         """
-        for t in self.tools:
-            if t.name == name:
-                return t
-        return None
+        return self._tool_index.get(name)
+
+    def _use_tool(self, tool_call: ToolCall) -> Notion:
+        """
+        Uses the Tool named by a single ToolCall, returning a Notion
+        containing its ToolCallResponse.
+
+        Args:
+            tool_call (ToolCall): The ToolCall to use.
+
+        Returns:
+            Notion: The Notion containing the ToolCallResponse, with a role of
+                ChatRole.TOOL_RESPONSE.
+        """
+        function = tool_call.function
+        tool = self._find_tool(function.name)
+        if tool is not None:
+            tc_function_response = {}
+            with contextlib.suppress(json.JSONDecodeError):
+                tc_function_response = json_loads(function.arguments)
+
+            tc_response = ToolCallResponse.from_tool_call(
+                tool_call=tool_call, response=tool(**tc_function_response)
+            )
+            return Notion(
+                content=tc_response.model_dump_json(exclude_none=True),
+                role=self._tool_response_role,
+            )
+        return Notion(
+            content=json_dumps(
+                {
+                    "tool_call_id": tool_call.id,
+                    "content": "Tool not found",
+                    "name": "error",
+                }
+            ),
+            role=self._tool_response_role,
+        )
 
     def _use_tools(self, tool_calls: ToolCalls) -> List[Notion]:
         """
@@ -110,51 +217,52 @@ class Agent(BaseModel):
             List[Notion]: The Notions containing ToolCallResponses.
                 Each Notion will have a role of ChatRole.TOOL_RESPONSE.
         """
-        responses: List[Notion] = []
-        for tool_call in tool_calls.list:
-            tool = self._find_tool(tool_call.function.name)
-            if tool is not None:
-                tc_function_response = {}
-                with contextlib.suppress(json.JSONDecodeError):
-                    tc_function_response = json.loads(tool_call.function.arguments)
+        return [self._use_tool(tool_call) for tool_call in tool_calls.list]
 
-                tc_response = ToolCallResponse.from_tool_call(
-                    tool_call=tool_call, response=tool(**tc_function_response)
-                )
-                responses.append(
-                    Notion(
-                        content=tc_response.model_dump_json(exclude_none=True),
-                        role=str(self.role.TOOL_RESPONSE.value),
-                    )
-                )
-            else:
-                responses.append(
-                    Notion(
-                        content=json.dumps(
-                            {
-                                "tool_call_id": tool_call.id,
-                                "content": "Tool not found",
-                                "name": "error",
-                            }
-                        ),
-                        role=str(self.role.TOOL_RESPONSE.value),
-                    )
-                )
-        return responses
+    async def _ause_tools(self, tool_calls: ToolCalls) -> List[Notion]:
+        """
+        Asynchronously uses Tools based on the given ToolCalls, returning Notions
+        containing ToolCallResponses in the same order as the ToolCalls.
+
+        Tools run concurrently in the default executor, at most
+        `max_tool_concurrency` at a time.
+
+        Args:
+            tool_calls (ToolCalls): The ToolCalls to use.
+
+        Returns:
+            List[Notion]: The Notions containing ToolCallResponses.
+                Each Notion will have a role of ChatRole.TOOL_RESPONSE.
+        """
+        if len(tool_calls.list) <= 1:
+            return self._use_tools(tool_calls)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_tool_concurrency)
+
+        async def use_tool(tool_call: ToolCall) -> Notion:
+            async with semaphore:
+                return await loop.run_in_executor(None, self._use_tool, tool_call)
+
+        return list(await asyncio.gather(*(use_tool(tc) for tc in tool_calls.list)))
 
     def _bind_tools(self) -> None:
         """
-        Called at the end of __init__ to bind the tools to the model.
+        Called at the end of __init__ and whenever `tools` changes, once the
+        tool lookup is rebuilt, to bind the tools to the model.
 
         This MUST be redefined in subclasses to dictate how
         the tools are bound to the model.
 
         Example:
         ```python
-        # From OpenAIChatAgent
+        # Similar to OpenAIChatAgent
         def _bind_tools(self) -> None:
             m_tools: List[ChatCompletionToolParam] = [
-                {"type": "function", "function": tool.description}
+                {
+                    "type": "function",
+                    "function": tool.description.model_dump(exclude_none=True),
+                }
                 for tool in self.tools
             ]
 
@@ -169,14 +277,12 @@ class Agent(BaseModel):
         Adds a tool to the agent.
         """
         self.tools.append(tool)
-        self._bind_tools()
 
     def add_tools(self, tools: List[Tool]) -> None:
         """
         Adds a list of tools to the agent.
         """
         self.tools.extend(tools)
-        self._bind_tools()
 
     def remove_tool(self, name: str) -> None:
         """
@@ -186,7 +292,6 @@ class Agent(BaseModel):
             if tool.name == name:
                 self.tools.pop(i)
                 break
-        self._bind_tools()
 
     def _process_messages(self, messages: Messages) -> List[Notion]:
         """Convert various message types into a list of Notions."""
@@ -197,12 +302,9 @@ class Agent(BaseModel):
         elif isinstance(messages, Idearium):
             return messages.notions
         elif isinstance(messages, list):
+            human = str(self.role.HUMAN.value)
             return [
-                (
-                    Notion(content=msg, role=str(self.role.HUMAN.value))
-                    if isinstance(msg, str)
-                    else msg
-                )
+                Notion(content=msg, role=human) if isinstance(msg, str) else msg
                 for msg in messages
             ]
         raise ValueError(f"Unsupported message type: {type(messages)}")
@@ -212,21 +314,24 @@ class Agent(BaseModel):
     ) -> List[Notion]:
         """Wrapper around shared logic between generate and agenerate."""
         response = responses[0]
-        # logger.debug(f"Response: {response}")
-        if response.chat_role == ChatRole.TOOL_CALL:
+        # logger.debug("Response: %s", response)
+        if response.chat_role is ChatRole.TOOL_CALL:
             # logger.debug("Tool call detected")
             # Add the tool call to the idearium
             self.idearium.append(response)
             # Call generate again with the tool response
-            tool_calls = ToolCalls.model_validate_json(
-                '{"list": ' + response.content + "}"
-            )
-            tool_response = self._use_tools(tool_calls)
-            # logger.debug(f"Tool response: {tool_response}")
+            tool_calls = ToolCalls.from_json(response.content)
             if is_async:
-                return self.agenerate(tool_response)
-            else:
-                return self.generate(tool_response)
+
+                async def respond():
+                    tool_response = await self._ause_tools(tool_calls)
+                    return await self.agenerate(tool_response)
+
+                return respond()
+
+            tool_response = self._use_tools(tool_calls)
+            # logger.debug("Tool response: %s", tool_response)
+            return self.generate(tool_response)
         else:
             return responses
 
@@ -275,15 +380,12 @@ class Agent(BaseModel):
 
         return r
 
-    def _process_tool_calls(self, tool_calls: ToolCalls):
+    def _record_tool_calls(self, tool_calls: ToolCalls) -> bool:
         """
-        Processes tool calls and returns the tool response.
-
-        Args:
-            tool_calls (ToolCalls): The tool calls to process.
+        Drops invalid tool calls and adds the rest to the idearium.
 
         Returns:
-            Optional[ToolCalls]: The tool response. If None, no tool calls were found.
+            bool: Whether any tool calls are left to use.
         """
         for i, tool_call in enumerate(tool_calls.list):
             if not tool_call.id.startswith("call_"):
@@ -294,24 +396,47 @@ class Agent(BaseModel):
                     + f"{tool_call.model_dump_json(exclude_none=True)}"
                 )
 
-        tc_dump = tool_calls.model_dump(exclude_none=True)
-        if tc_dump.get("list"):
-            logger.debug(f"Tool calls: {tc_dump}")
+        if tool_calls.list:
+            content = tool_calls.to_json()
+            logger.debug("Tool calls: %s", content)
 
             # Create a new notion from the tool calls
-            tc_notion = Notion(
-                content=json.dumps(tc_dump.get("list")),
-                role=str(ChatRole.TOOL_CALL.value),
-            )
+            tc_notion = Notion(content=content, role=str(ChatRole.TOOL_CALL.value))
 
             # Add the tool call to the idearium
             self.idearium.append(tc_notion)
-            # Call stream again with the tool response
-            tool_response = self._use_tools(tool_calls)
-            return tool_response
-        else:
-            logger.error("No tool calls found")
-            return None
+            return True
+
+        logger.error("No tool calls found")
+        return False
+
+    def _process_tool_calls(self, tool_calls: ToolCalls):
+        """
+        Processes tool calls and returns the tool response.
+
+        Args:
+            tool_calls (ToolCalls): The tool calls to process.
+
+        Returns:
+            Optional[ToolCalls]: The tool response. If None, no tool calls were found.
+        """
+        if self._record_tool_calls(tool_calls):
+            return self._use_tools(tool_calls)
+        return None
+
+    async def _aprocess_tool_calls(self, tool_calls: ToolCalls):
+        """
+        Asynchronously processes tool calls and returns the tool response.
+
+        Args:
+            tool_calls (ToolCalls): The tool calls to process.
+
+        Returns:
+            Optional[ToolCalls]: The tool response. If None, no tool calls were found.
+        """
+        if self._record_tool_calls(tool_calls):
+            return await self._ause_tools(tool_calls)
+        return None
 
     def stream(self, messages: Messages, **kwargs):
         """
@@ -336,13 +461,16 @@ class Agent(BaseModel):
         tool_calls: Optional[ToolCalls] = None
 
         for r in response_stream:
-            if r.chat_role == ChatRole.TOOL_CALL:
-                logger.debug(f"Tool call detected: {r.content}")
-                tc_chunks = ToolCalls.model_validate_json('{"list": ' + r.content + "}")
-                tool_calls = tool_calls and tool_calls.concat(tc_chunks) or tc_chunks
+            if r.chat_role is ChatRole.TOOL_CALL:
+                logger.debug("Tool call detected: %s", r.content)
+                tc_chunks = ToolCalls.from_json(r.content)
+                if tool_calls is None:
+                    tool_calls = tc_chunks
+                else:
+                    tool_calls.extend(tc_chunks)
                 continue
             elif r.content is not None:
-                logger.debug(f"Got chunk in stream: {r.content!r}")
+                logger.debug("Got chunk in stream: %r", r.content)
                 if self.auto_append_response:
                     self.idearium.append(r)
                 yield r
@@ -352,8 +480,7 @@ class Agent(BaseModel):
             logger.debug("Moving to tool response stream")
             tool_response = self._process_tool_calls(tool_calls)
             if tool_response is not None:
-                for r in self.stream(tool_response):
-                    yield r
+                yield from self.stream(tool_response)
 
     async def astream(self, messages: Messages, **kwargs):
         """
@@ -378,13 +505,16 @@ class Agent(BaseModel):
         tool_calls: Optional[ToolCalls] = None
 
         async for r in response_stream:
-            if r.chat_role == ChatRole.TOOL_CALL:
-                logger.debug(f"Tool call detected: {r.content}")
-                tc_chunks = ToolCalls.model_validate_json('{"list": ' + r.content + "}")
-                tool_calls = tool_calls and tool_calls.concat(tc_chunks) or tc_chunks
+            if r.chat_role is ChatRole.TOOL_CALL:
+                logger.debug("Tool call detected: %s", r.content)
+                tc_chunks = ToolCalls.from_json(r.content)
+                if tool_calls is None:
+                    tool_calls = tc_chunks
+                else:
+                    tool_calls.extend(tc_chunks)
                 continue
             elif r.content is not None:
-                logger.debug(f"Got chunk in astream: {r.content!r}")
+                logger.debug("Got chunk in astream: %r", r.content)
                 if self.auto_append_response:
                     self.idearium.append(r)
                 yield r
@@ -392,7 +522,7 @@ class Agent(BaseModel):
         # Handle tool calls if any
         if tool_calls is not None:
             logger.debug("Moving to tool response stream")
-            tool_response = self._process_tool_calls(tool_calls)
+            tool_response = await self._aprocess_tool_calls(tool_calls)
             if tool_response is not None:
                 async for r in self.astream(tool_response):
                     yield r
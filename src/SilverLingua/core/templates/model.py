@@ -1,10 +1,11 @@
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Callable, Generator, List, Type, Union
+from typing import Any, Callable, Generator, List, Optional, Type, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from ..atoms import ChatRole, Tokenizer
 from ..molecules import Notion
@@ -18,6 +19,13 @@ A type alias for the various types of messages that can be passed to a model.
 """
 
 
+_MAX_RETRIES = 3
+_RETRY_BASE_DELAY = 0.5
+"""
+Seconds to wait before the first retry, doubling with each retry after.
+"""
+
+
 class ModelType(Enum):
     CHAT = 0
     EMBEDDING = 1
@@ -74,6 +82,8 @@ class Model(BaseModel, ABC):
     llm_async: Callable
     can_stream: bool
     tokenizer: Tokenizer
+    #
+    _last_idearium: Optional[Idearium] = PrivateAttr(default=None)
 
     @property
     @abstractmethod
@@ -84,25 +94,30 @@ class Model(BaseModel, ABC):
         pass
 
     def _process_input(self, messages: Messages) -> Idearium:
+        # Model roles may be built with `create_chat_role`, whose members
+        # Notion can't validate directly, so pass the role's value.
+        human = str(self.role.HUMAN.value)
         if isinstance(messages, str):
-            notions = [Notion(content=messages, role=self.role.HUMAN)]
+            notions = [Notion(content=messages, role=human)]
         elif isinstance(messages, Notion):
             notions = [messages]
         elif isinstance(messages, Idearium):
             return messages  # Already an Idearium, no need to convert
         elif isinstance(messages, list):
             notions = [
-                (
-                    Notion(content=msg, role=self.role.HUMAN)
-                    if isinstance(msg, str)
-                    else msg
-                )
+                (Notion(content=msg, role=human) if isinstance(msg, str) else msg)
                 for msg in messages
             ]
         else:
             raise ValueError("Invalid input type for messages")
 
-        return Idearium(self.tokenizer, self.max_tokens, notions)
+        # Callers commonly resend the whole conversation every turn, so
+        # only tokenize what was added since the last call.
+        idearium = Idearium.from_list(
+            self.tokenizer, self.max_tokens, notions, prior=self._last_idearium
+        )
+        self._last_idearium = idearium
+        return idearium
 
     def _convert_role(self, role: ChatRole) -> str:
         """
@@ -154,37 +169,66 @@ class Model(BaseModel, ABC):
         """
         pass
 
-    @abstractmethod
-    def _retry_call(
+    def _prepare_retry_input(
+        self,
+        input: Union[str, object, List[any]],
+        e: Exception,  # noqa: ARG002
+    ) -> Union[str, object, List[any]]:
+        """
+        Returns the input to retry with after a call with `input` failed with
+        `e`, e.g. with a message telling the model about the error.
+
+        This is called by `_common_call_logic` and `_acommon_call_logic`, which
+        then make the call again themselves.
+        <span style="color:var(--md-accent-fg-color)">*(Optional)*</span>
+        """
+        return input
+
+    def _common_call_logic(
         self,
         input: Union[str, object, List[any]],
-        e: Exception,
         api_call: Callable,
         retries: int = 0,
     ) -> Union[str, object]:
         """
-        Retry logic for API calls used by `_common_call_logic`.
+        Calls `api_call` with `input`, backing off and retrying with the input
+        from `_prepare_retry_input` when it fails, at most `_MAX_RETRIES` times
+        counting the `retries` already made.
         """
-        pass
+        if input is None:
+            raise ValueError("No input provided.")
 
-    def _common_call_logic(
+        for attempt in range(min(retries, _MAX_RETRIES), _MAX_RETRIES + 1):
+            try:
+                return api_call(messages=input)
+            except Exception as e:
+                logger.error("Error calling LLM API: %s", e)
+                if attempt == _MAX_RETRIES:
+                    raise
+                input = self._prepare_retry_input(input, e)
+            time.sleep(_RETRY_BASE_DELAY * 2**attempt)
+
+    async def _acommon_call_logic(
         self,
         input: Union[str, object, List[any]],
         api_call: Callable,
         retries: int = 0,
     ) -> Union[str, object]:
+        """
+        `_common_call_logic` for async API calls.
+        """
         if input is None:
             raise ValueError("No input provided.")
 
-        try:
-            out = api_call(messages=input)
-            return out
-        except Exception as e:
-            logger.error(f"Error calling LLM API: {e}")
-            if retries >= 3:
-                raise e
-
-            return self._retry_call(input, e, api_call, retries=retries)
+        for attempt in range(min(retries, _MAX_RETRIES), _MAX_RETRIES + 1):
+            try:
+                return await api_call(messages=input)
+            except Exception as e:
+                logger.error("Error calling LLM API: %s", e)
+                if attempt == _MAX_RETRIES:
+                    raise
+                input = self._prepare_retry_input(input, e)
+            await asyncio.sleep(_RETRY_BASE_DELAY * 2**attempt)
 
     def _call(
         self, input: Union[str, object, List[any]], retries: int = 0, **kwargs
@@ -217,10 +261,14 @@ class Model(BaseModel, ABC):
         async def api_call(**kwargs_):
             return await self.llm_async(**kwargs_, **kwargs)
 
-        result = self._common_call_logic(input, api_call, retries)
-        if asyncio.iscoroutine(result):
-            return await result
-        return result
+        return await self._acommon_call_logic(input, api_call, retries)
+
+    def _prepare_input(self, messages: Messages) -> Any:
+        """
+        Runs `messages` through `_process_input`, `_preprocess` and
+        `_format_request`, returning the input to pass to `_call`/`_acall`.
+        """
+        return self._format_request(self._preprocess(self._process_input(messages)))
 
     def _common_generate_logic(
         self,
@@ -232,9 +280,7 @@ class Model(BaseModel, ABC):
             raise ValueError("No messages provided.")
 
         call_method = self._acall if is_async else self._call
-
-        idearium = self._process_input(messages)
-        input = self._format_request(self._preprocess(idearium))
+        input = self._prepare_input(messages)
 
         if is_async:
 
@@ -286,6 +332,64 @@ class Model(BaseModel, ABC):
         """
         pass
 
+    async def abatch(
+        self,
+        messages_list: List[Messages],
+        max_concurrency: int = 5,
+        requests_per_minute: Optional[float] = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[List[Notion], BaseException]]:
+        """
+        Generates responses for several independent conversations concurrently,
+        at most `max_concurrency` requests at a time.
+
+        Args:
+            messages_list (List[Messages]): The conversations to respond to.
+            max_concurrency (int, optional): The maximum number of requests in
+                flight at once. Defaults to 5.
+            requests_per_minute (float, optional): If set, requests are started
+                evenly spaced so that no more than this many start per minute.
+            return_exceptions (bool, optional): If True, a failed conversation's
+                exception is returned in its place instead of being raised.
+                Defaults to False.
+            **kwargs: Passed on to `agenerate` for every conversation.
+
+        Returns:
+            List[List[Notion]]: The responses, in the same order as `messages_list`.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+        interval = 60 / requests_per_minute if requests_per_minute else 0.0
+        next_start = loop.time()
+        start_lock = asyncio.Lock()
+
+        async def wait_for_turn() -> None:
+            nonlocal next_start
+            async with start_lock:
+                delay = next_start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_start = max(next_start, loop.time()) + interval
+
+        async def generate(messages: Messages) -> List[Notion]:
+            async with semaphore:
+                if interval:
+                    await wait_for_turn()
+                return await self.agenerate(messages, **kwargs)
+
+        return list(
+            await asyncio.gather(
+                *(generate(m) for m in messages_list),
+                return_exceptions=return_exceptions,
+            )
+        )
+
     def _common_stream_logic(self, messages: Messages):
         if messages is None:
             raise ValueError("No messages provided.")
@@ -296,9 +400,7 @@ class Model(BaseModel, ABC):
                 + "Please use the `generate` method instead."
             )
 
-        idearium = self._process_input(messages)
-        input = self._format_request(self._preprocess(idearium))
-        return input
+        return self._prepare_input(messages)
 
     @abstractmethod
     def stream(
@@ -1,6 +1,48 @@
+import json
 import logging
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from functools import wraps
+from typing import Any, Iterator, Optional, Tuple, Union
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serializes `obj` to a compact JSON string, e.g. tool results and request
+    payloads.
+
+    Uses `orjson` when it is installed (the `fast-json` extra), falling back to
+    the standard library for anything it can't encode or when it isn't
+    available. Both write the same output: no spaces after separators,
+    non-ASCII characters as is, and non-string keys as strings. The one
+    difference is that `orjson` writes NaN and Infinity as `null`, while the
+    standard library writes them as the non-standard `NaN` and `Infinity`.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def json_loads(s: Union[str, bytes]) -> Any:
+    """
+    Parses a JSON string, using `orjson` when it is installed.
+
+    Raises `json.JSONDecodeError` on invalid input either way.
+    """
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
 
 
 def timeit(func):
@@ -33,6 +75,66 @@ def timeit(func):
     return wrapper
 
 
+class ResponseCache(MutableMapping):
+    """
+    An in-memory LRU mapping whose entries can expire, for use as a model's
+    response `cache`.
+
+    Only cache responses you'd be happy to get again for the same request,
+    e.g. those generated with a temperature of 0.
+
+    Example:
+        ```python
+        model = OpenAIModel("gpt-4", cache=ResponseCache(maxsize=512, ttl=3600))
+        ```
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize (int, optional): The maximum number of entries. The least
+                recently used entry is evicted first. Defaults to 256.
+            ttl (float, optional): How many seconds an entry stays valid.
+                If None, entries never expire.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry time or None, value), least recently used first.
+        self._data: OrderedDict[Any, Tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            expires, value = self._data[key]
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        # Expired entries are only dropped when looked up.
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class ImmutableAttributeError(Exception):
     def __init__(self, message, source=None):
         if source is not None:
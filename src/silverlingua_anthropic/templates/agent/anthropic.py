@@ -18,10 +18,6 @@ class AnthropicChatAgent(Agent):
 
     model: AnthropicModel
 
-    @property
-    def model(self) -> AnthropicModel:
-        return self._model
-
     def _bind_tools(self) -> None:
         """Bind tools to the model."""
         if not self.tools:
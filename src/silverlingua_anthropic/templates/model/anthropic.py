@@ -1,14 +1,15 @@
-import json
 import logging
 import os
-from typing import Callable, List, Optional, Type, Union
+from json import JSONDecodeError
+from typing import List, Optional, Type, Union
 
 from anthropic.types import Message, MessageStreamEvent
 from pydantic import ConfigDict, Field
-
 from silverlingua.core.atoms import ChatRole, Tokenizer
 from silverlingua.core.molecules import Notion
 from silverlingua.core.templates.model import Messages, Model, ModelType
+from silverlingua.util import json_loads
+
 from silverlingua_anthropic import Anthropic, AsyncAnthropic
 
 from ...atoms import AnthropicChatRole
@@ -16,6 +17,15 @@ from .util import AnthropicModelName, AnthropicModels, CompletionParams
 
 logger = logging.getLogger(__name__)
 
+_ROLE_SYSTEM = str(AnthropicChatRole.SYSTEM.value)
+_ROLE_HUMAN = str(AnthropicChatRole.HUMAN.value)
+_ROLE_AI = str(AnthropicChatRole.AI.value)
+_ROLE_TOOL_CALL = str(AnthropicChatRole.TOOL_CALL.value)
+
+# Roles of the Notions built from responses, which use the standard roles.
+_NOTION_AI = str(ChatRole.AI.value)
+_NOTION_TOOL_CALL = str(ChatRole.TOOL_CALL.value)
+
 
 class AnthropicModel(Model):
     """
@@ -69,30 +79,29 @@ class AnthropicModel(Model):
         for msg in messages:
             msg_content = ""
             try:
-                msg_content = json.loads(msg.content)
-            except json.decoder.JSONDecodeError:
+                msg_content = json_loads(msg.content)
+            except JSONDecodeError:
                 if msg.content != "":
                     msg_content = msg.content
 
-            if msg.chat_role == ChatRole.AI:
+            if msg.chat_role is ChatRole.AI:
                 if (
                     isinstance(msg_content, list)
                     and len(msg_content) > 0
                     and isinstance(msg_content[0], dict)
                     and "function" in msg_content[0]
                 ):
-                    # Handle tool calls
-                    tool_calls = msg_content
+                    # Handle tool calls; msg.content is already their JSON
                     formatted_messages.append(
                         {
-                            "role": str(AnthropicChatRole.TOOL_CALL.value),
-                            "content": json.dumps(tool_calls),
+                            "role": _ROLE_TOOL_CALL,
+                            "content": msg.content,
                         }
                     )
                 else:
                     formatted_messages.append(
                         {
-                            "role": str(AnthropicChatRole.AI.value),
+                            "role": _ROLE_AI,
                             "content": msg_content,
                         }
                     )
@@ -118,24 +127,18 @@ class AnthropicModel(Model):
             # Streaming response
             if response.type == "content_block_delta":
                 if hasattr(response.delta, "text"):
-                    output.append(
-                        Notion(content=response.delta.text, role=str(ChatRole.AI.value))
-                    )
+                    output.append(Notion(content=response.delta.text, role=_NOTION_AI))
             elif response.type == "input_json_delta":
                 output.append(
                     Notion(
                         content=response.delta.partial_json,
-                        role=str(ChatRole.TOOL_CALL.value),
+                        role=_NOTION_TOOL_CALL,
                     )
                 )
         else:
             # Standard response
             if response.content and len(response.content) > 0:
-                output.append(
-                    Notion(
-                        content=response.content[0].text, role=str(ChatRole.AI.value)
-                    )
-                )
+                output.append(Notion(content=response.content[0].text, role=_NOTION_AI))
 
         return output
 
@@ -143,14 +146,8 @@ class AnthropicModel(Model):
         """Post-process the response."""
         return response
 
-    def _retry_call(
-        self,
-        input: List[dict],
-        e: Exception,
-        api_call: Callable,
-        retries: int = 0,
-    ):
-        """Retry logic for API calls."""
+    def _prepare_retry_input(self, input: List[dict], e: Exception) -> List[dict]:
+        """Drops the failed turn and tells the model about the error."""
         if not isinstance(input, list):
             raise ValueError("Input must be a list of message dicts.")
 
@@ -159,25 +156,27 @@ class AnthropicModel(Model):
                 f"Invalid model type: {self.type}. " + "Only chat models are supported."
             )
 
-        inp = input.copy()
         # Remove everything since the last user message
-        for i in range(len(inp) - 1, -1, -1):
-            if inp[i]["role"] == str(AnthropicChatRole.HUMAN.value):
-                inp = inp[: i + 1]
-                break
+        last_human = next(
+            (
+                len(input) - i
+                for i, msg in enumerate(reversed(input))
+                if msg["role"] == _ROLE_HUMAN
+            ),
+            None,
+        )
+        inp = input[:last_human] if last_human is not None else input.copy()
 
         # Inform the AI
         inp.append(
             {
-                "role": str(AnthropicChatRole.SYSTEM.value),
+                "role": _ROLE_SYSTEM,
                 "content": f"Error calling Anthropic API: {e}. "
                 + "Do not try to repeat the last action.",
             }
         )
 
-        # Try again
-        retries += 1
-        return self._common_call_logic(inp, api_call, retries)
+        return inp
 
     def generate(
         self,
@@ -1,8 +1,10 @@
 import logging
-from typing import List, Optional
-
-from openai.types.chat.chat_completion_create_params import ChatCompletionToolParam
+from collections.abc import MutableMapping
+from typing import Dict, List, Optional, Tuple
 
+import httpx
+from openai.types.chat import ChatCompletionToolParam
+from pydantic import PrivateAttr
 from silverlingua.core.atoms import Tool
 from silverlingua.core.organisms import Idearium
 from silverlingua.core.templates.agent import Agent
@@ -19,19 +21,38 @@ class OpenAIChatAgent(Agent):
     """
 
     model: OpenAIModel
+    _tool_params: Dict[str, Tuple[Tool, ChatCompletionToolParam]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def _tool_param(self, tool: Tool) -> ChatCompletionToolParam:
+        """
+        Gets the tool param for `tool`, reusing the one built on a previous bind.
+        """
+        cached = self._tool_params.get(tool.name)
+        if cached is not None and cached[0] is tool:
+            return cached[1]
 
-    @property
-    def model(self) -> OpenAIModel:
-        return self._model
+        param: ChatCompletionToolParam = {
+            "type": "function",
+            "function": tool.description.model_dump(exclude_none=True),
+        }
+        self._tool_params[tool.name] = (tool, param)
+        return param
 
     def _bind_tools(self) -> None:
+        if not self.tools:
+            if self._tool_params:
+                # Unbind the tools this agent bound before; OpenAI rejects
+                # an empty tools list.
+                self._tool_params.clear()
+                self.model.completion_params.tools = None
+            return
+
         m_tools: List[ChatCompletionToolParam] = [
-            {"type": "function", "function": tool.description} for tool in self.tools
+            self._tool_param(tool) for tool in self.tools
         ]
-
-        # Check to make sure m_tools is not empty
-        if len(m_tools) > 0:
-            self.model.completion_params.tools = m_tools
+        self.model.completion_params.tools = m_tools
 
     def __init__(
         self,
@@ -40,6 +61,8 @@ class OpenAIChatAgent(Agent):
         tools: Optional[List[Tool]] = None,
         api_key: Optional[str] = None,
         completion_params: Optional[CompletionParams] = None,
+        cache: Optional[MutableMapping] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initializes the OpenAI chat agent.
@@ -55,9 +78,17 @@ class OpenAIChatAgent(Agent):
             If None, will attempt to use os.getenv("OPENAI_API_KEY").
             completion_params (CompletionParams, optional): The completion parameters
             to use.
+            cache (MutableMapping, optional): A mapping used to cache responses to
+            identical requests. If None, responses are not cached.
+            http_client (httpx.AsyncClient, optional): The HTTP client used for
+            async requests. If None, a shared default client is used.
         """
         model = OpenAIModel(
-            name=model_name, api_key=api_key, completion_params=completion_params
+            name=model_name,
+            api_key=api_key,
+            completion_params=completion_params,
+            cache=cache,
+            http_client=http_client,
         )
         # print(f"Testing 2: Tokenizer: {model.tokenizer}")
 
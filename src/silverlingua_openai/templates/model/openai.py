@@ -1,14 +1,22 @@
+import hashlib
 import json
 import logging
 import os
-from typing import Callable, List, Optional, Type, Union
+import re
+import time
+from collections.abc import MutableMapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
+import httpx
 import tiktoken
+from openai import AsyncOpenAI, OpenAI
 from openai._streaming import AsyncStream, Stream
 from openai.resources import (
     AsyncModerations,
     Moderations,
 )
+from openai.types import CompletionUsage
 from openai.types.chat import (
     ChatCompletion,
     ChatCompletionAssistantMessageParam,
@@ -17,22 +25,321 @@ from openai.types.chat import (
     ChatCompletionMessageToolCall,
     ChatCompletionToolMessageParam,
 )
+from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
 from openai.types.chat.completion_create_params import (
     CompletionCreateParams,
     CompletionCreateParamsNonStreaming,
 )
-from pydantic import ConfigDict, Field
-
-from SilverLingua.core.atoms import ChatRole, Tokenizer
-from SilverLingua.core.molecules import Notion
-from SilverLingua.core.templates.model import Messages, Model, ModelType
-from silverlingua_openai import AsyncOpenAI, OpenAI
+from pydantic import ConfigDict, Field, InstanceOf, PrivateAttr
+from silverlingua.core.atoms import ChatRole, Tokenizer, ToolCall, ToolCalls
+from silverlingua.core.molecules import Notion
+from silverlingua.core.templates.model import Messages, Model, ModelType
+from silverlingua.util import json_dumps, json_loads
 
 from ...atoms import OpenAIChatRole
-from .util import CompletionParams, OpenAIModelName, OpenAIModels
+from .util import (
+    CompletionParams,
+    OpenAIChatModels,
+    OpenAIEmbeddingModels,
+    OpenAIModelName,
+    OpenAIModels,
+)
 
 logger = logging.getLogger(__name__)
 
+# ChatRole defines __eq__ without __hash__, so the map is keyed by member name.
+_ROLE_TO_OPENAI: Dict[str, str] = {
+    role.name: str(OpenAIChatRole[role.name].value) for role in ChatRole
+}
+_ROLE_SYSTEM = _ROLE_TO_OPENAI[ChatRole.SYSTEM.name]
+_ROLE_HUMAN = _ROLE_TO_OPENAI[ChatRole.HUMAN.name]
+_ROLE_TOOL_CALL = _ROLE_TO_OPENAI[ChatRole.TOOL_CALL.name]
+_ROLE_TOOL_RESPONSE = _ROLE_TO_OPENAI[ChatRole.TOOL_RESPONSE.name]
+
+# Roles of the Notions built from responses, which use the standard roles.
+_NOTION_AI = str(ChatRole.AI.value)
+_NOTION_TOOL_CALL = str(ChatRole.TOOL_CALL.value)
+
+_BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+_JSON_CONTAINER_START = re.compile(r"\s*[\[{]")
+
+
+def _parse_content(content: str) -> Any:
+    """
+    Parses JSON message content, falling back to the raw string.
+
+    Only JSON objects and arrays are parsed; anything else (i.e. plain text)
+    is returned as is without attempting a parse.
+    """
+    if not _JSON_CONTAINER_START.match(content):
+        return content
+    try:
+        return json_loads(content)
+    except json.JSONDecodeError:
+        return content
+
+
+def _format_ai(msg: Notion, role: str) -> Optional[ChatCompletionAssistantMessageParam]:
+    """
+    Formats an AI message, which may hold tool calls.
+
+    Returns None if it only held tool calls without a string ID.
+    """
+    content = msg.content
+    msg_content = _parse_content(content)
+    if not (
+        isinstance(msg_content, list)
+        and len(msg_content) > 0
+        and isinstance(msg_content[0], dict)
+        and "function" in msg_content[0]
+    ):
+        return {"role": role, "content": content}
+
+    """
+    # msg.content is the same as "tool_calls" in this case
+    msg.content = [
+        {
+            "id": "0",
+            "type": "function",
+            "function": {
+                "name": "get_weather",
+                "arguments": {
+                    "location": "New York City",
+                }
+            }
+        }
+    ]
+    """
+    return _tool_calls_param(msg_content)
+
+
+def _format_tool_call(
+    msg: Notion, role: str
+) -> Optional[ChatCompletionAssistantMessageParam]:
+    """
+    Formats a tool call message, whose content is the JSON list of its tool
+    calls, so it doesn't need to be probed like an AI message.
+
+    Content that isn't a list of tool call dicts, e.g. a raw fragment streamed
+    before the tool call was assembled, is sent as plain content.
+
+    Returns None if it only held tool calls without a string ID.
+    """
+    msg_content = _parse_content(msg.content)
+    if (
+        not isinstance(msg_content, list)
+        or not msg_content
+        or not all(isinstance(tool_call, dict) for tool_call in msg_content)
+    ):
+        return _format_default(msg, role)
+    return _tool_calls_param(msg_content)
+
+
+def _tool_calls_param(
+    tool_calls: List[ChatCompletionMessageToolCall],
+) -> Optional[ChatCompletionAssistantMessageParam]:
+    # Remove any tool calls that don't have a string ID, keeping the parsed
+    # list as is in the usual case where they all do.
+    if not all(isinstance(tool_call["id"], str) for tool_call in tool_calls):
+        tool_calls = [
+            tool_call for tool_call in tool_calls if isinstance(tool_call["id"], str)
+        ]
+
+    # If there are no tool calls left, skip this message
+    if len(tool_calls) == 0:
+        return None
+
+    return {"role": _ROLE_TOOL_CALL, "tool_calls": tool_calls}
+
+
+def _format_tool_response(msg: Notion, role: str) -> ChatCompletionToolMessageParam:
+    """
+    Formats a tool response message.
+
+    msg.content = {
+        "tool_call_id": "0",
+        "name": "get_weather",
+        "content": {
+            "temperature": "70",
+        }
+    }
+    """
+    msg_content = _parse_content(msg.content)
+    return {
+        "content": msg_content["content"],
+        "role": role,
+        "tool_call_id": msg_content["tool_call_id"],
+    }
+
+
+def _format_default(msg: Notion, role: str) -> ChatCompletionMessageParam:
+    return {"role": role, "content": msg.content}
+
+
+_ROLE_HANDLERS: Dict[
+    str, Callable[[Notion, str], Optional[ChatCompletionMessageParam]]
+] = {
+    ChatRole.AI.name: _format_ai,
+    ChatRole.TOOL_CALL.name: _format_tool_call,
+    ChatRole.TOOL_RESPONSE.name: _format_tool_response,
+}
+"""
+Formats a message for the chat completion API by its ChatRole name, given the
+message and its OpenAI role.
+"""
+
+_get_encoding = lru_cache(maxsize=16)(tiktoken.encoding_for_model)
+"""
+Gets the tiktoken encoding for a model name, shared across models.
+"""
+
+
+_ENCODE_CACHE_SIZE = 1024
+"""
+The number of encoded strings each model name's Tokenizer remembers.
+"""
+
+_ENCODE_CACHE_MAX_CHARS = 512
+"""
+The longest string each model name's Tokenizer caches the encoding of.
+"""
+
+
+@lru_cache(maxsize=16)
+def _get_tokenizer(name: str) -> Tokenizer:
+    """
+    Gets the Tokenizer for a model name, shared across models.
+
+    Short strings such as role prompts and tool results recur across calls, so
+    their encodings are cached. Longer strings are encoded every time, which
+    keeps the growing content of a streamed response (re-encoded by
+    `Idearium.append` for every chunk) from filling the cache with its
+    prefixes. tiktoken encodings and `lru_cache` are both safe to share
+    between threads.
+    """
+    encoding = _get_encoding(name)
+
+    @lru_cache(maxsize=_ENCODE_CACHE_SIZE)
+    def cached_encode(text: str) -> Tuple[int, ...]:
+        return tuple(encoding.encode(text))
+
+    def encode(text: str) -> List[int]:
+        if len(text) > _ENCODE_CACHE_MAX_CHARS:
+            return encoding.encode(text)
+        # Hand out a fresh list so callers can't mutate the cached tokens.
+        return list(cached_encode(text))
+
+    # Exposed like on `lru_cache` functions, to inspect what is cached.
+    encode.cache_info = cached_encode.cache_info
+
+    return Tokenizer(encode=encode, decode=encoding.decode)
+
+
+@lru_cache(maxsize=None)
+def _get_client(api_key: str) -> OpenAI:
+    """
+    Gets the OpenAI client shared by every model using `api_key`, so that
+    they share one connection pool.
+    """
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    """
+    Gets the AsyncOpenAI client shared by every model using `api_key`, so that
+    they share one connection pool.
+    """
+    return AsyncOpenAI(api_key=api_key)
+
+
+def _dump_tool_call(
+    tool_call: Union[ChatCompletionMessageToolCall, ChoiceDeltaToolCall],
+) -> Dict[str, Any]:
+    """
+    Dumps an OpenAI tool call (or stream delta of one) to a dict.
+
+    The schema is fixed, so this reads the fields directly rather than going
+    through `model_dump`.
+    """
+    function = tool_call.function
+    data = {
+        "id": tool_call.id,
+        "function": (
+            {"name": function.name, "arguments": function.arguments}
+            if function is not None
+            else None
+        ),
+        "type": tool_call.type,
+    }
+    index = getattr(tool_call, "index", None)
+    if index is not None:
+        data["index"] = index
+    return data
+
+
+class _NotionBuffer:
+    """
+    Coalesces consecutive AI content Notions from a stream, so that fast streams
+    yield fewer, larger Notions.
+
+    Buffered content is flushed once `flush_interval` seconds have passed since
+    the last flush, once at least `max_chars` characters or `max_size` deltas
+    are buffered, when any other kind of Notion arrives, and at the end of the
+    stream.
+
+    These conditions are only checked as Notions are added, not on a timer, so
+    content buffered before the stream stalls is held until the next delta
+    arrives or the stream ends.
+    """
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_chars: Optional[int] = None,
+        max_size: int = 50,
+    ):
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self.max_size = max_size
+        self._parts: List[str] = []
+        self._chars = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, notion: Notion) -> List[Notion]:
+        """
+        Buffers `notion`, returning the Notions that are ready to be yielded.
+        """
+        if notion.role != _NOTION_AI:
+            return self.flush() + [notion]
+
+        self._parts.append(notion.content)
+        self._chars += len(notion.content)
+        if (
+            len(self._parts) >= self.max_size
+            or (self.max_chars is not None and self._chars >= self.max_chars)
+            or (
+                self.flush_interval is not None
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        ):
+            return self.flush()
+        return []
+
+    def flush(self) -> List[Notion]:
+        """
+        Returns the buffered content as a single Notion, if there is any.
+        """
+        self._last_flush = time.monotonic()
+        if not self._parts:
+            return []
+        content = "".join(self._parts)
+        self._parts.clear()
+        self._chars = 0
+        return [Notion.model_construct(content=content, role=_NOTION_AI)]
+
 
 class OpenAIModel(Model):
     """
@@ -54,6 +361,26 @@ class OpenAIModel(Model):
     client_async: AsyncOpenAI
     # Model parameters
     role: Type[ChatRole] = OpenAIChatRole
+    cache: Optional[InstanceOf[MutableMapping]] = Field(
+        default=None,
+        exclude=True,
+        description="Optional mapping used to cache non-streamed responses "
+        + "by request. Responses containing tool calls are never cached.",
+    )
+    _last_usage: Optional[CompletionUsage] = PrivateAttr(default=None)
+    # The model's total token limit, looked up once in __init__.
+    _context_window: int = PrivateAttr(default=0)
+
+    @property
+    def last_usage(self) -> Optional[CompletionUsage]:
+        """
+        The token usage OpenAI reported for the most recent non-streamed response.
+
+        Prefer this over re-tokenizing the prompt to count tokens, e.g.
+        `usage.prompt_tokens - usage.prompt_tokens_details.cached_tokens` for the
+        prompt tokens that weren't served from OpenAI's prompt cache.
+        """
+        return self._last_usage
 
     @property
     def moderation(self) -> Moderations:
@@ -73,177 +400,231 @@ class OpenAIModel(Model):
     def max_tokens(self) -> int:
         # Subtract the max response from the maximum number of tokens
         # to leave room for the response.
-        return OpenAIModels[self.name] - (self.completion_params.max_tokens or 124)
+        return self._context_window - (self.completion_params.max_tokens or 124)
 
-    @property
-    def __chat_args(self):
+    def __chat_args(self, create_params: Optional[dict] = None, **overrides):
         """
-        Boilerplate arguments for the OpenAI chat completion API to be unpacked.
+        Arguments for the OpenAI chat completion API to be unpacked.
+
+        Per-call `create_params` take precedence over `completion_params`,
+        and `overrides` over both.
         """
         return {
-            **self.completion_params.model_dump(exclude_none=True),
+            **self.completion_params.dump(),
             "model": self.name,
+            **(create_params or {}),
+            **overrides,
         }
 
+    def _preprocess(self, messages: List[Notion]) -> List[Notion]:
+        # _format_chat_request translates roles as it formats each message.
+        return messages
+
     def _format_request(
         self, messages: List[Notion]
     ) -> Union[str, List[ChatCompletionMessageParam]]:
-        input: Union[str, List[ChatCompletionMessageParam]] = []
-        if self.type == ModelType.CHAT:
-            input: List[ChatCompletionMessageParam] = []
-            for msg in messages:
-                # logger.debug(f"msg: {msg}")
-                msg_content = ""
-                try:
-                    msg_content = json.loads(msg.content)
-                except json.decoder.JSONDecodeError:
-                    if msg.content != "":
-                        msg_content = msg.content
-
-                if msg.chat_role == ChatRole.AI:
-                    ccim: ChatCompletionAssistantMessageParam
-                    if (
-                        isinstance(msg_content, list)
-                        and len(msg_content) > 0
-                        and isinstance(msg_content[0], dict)
-                        and "function" in msg_content[0]
-                    ):
-                        """
-                        # msg.content is the same as "tool_calls" in this case
-                        msg.content = [
-                            {
-                                "id": "0",
-                                "type": "function",
-                                "function": {
-                                    "name": "get_weather",
-                                    "arguments": {
-                                        "location": "New York City",
-                                    }
-                                }
-                            }
-                        ]
-                        """
-                        tool_calls: List[ChatCompletionMessageToolCall] = msg_content
-
-                        # Remove any tool calls that don't have a string ID
-                        tool_calls = [
-                            tool_call
-                            for tool_call in tool_calls
-                            if isinstance(tool_call["id"], str)
-                        ]
-
-                        # If there are no tool calls left, skip this message
-                        if len(tool_calls) == 0:
-                            continue
-
-                        ccim = {
-                            "role": str(OpenAIChatRole.TOOL_CALL.value),
-                            "tool_calls": tool_calls,
-                        }
-                    else:
-                        ccim = {"role": msg.role, "content": msg.content}
-                    input.append(ccim)
-                elif msg.chat_role == ChatRole.TOOL_RESPONSE:
-                    """
-                    msg.content = {
-                        "tool_call_id": "0",
-                        "name": "get_weather",
-                        "content": {
-                            "temperature": "70",
-                        }
-                    }
-                    """
-                    tool_response: ChatCompletionToolMessageParam = {
-                        "content": msg_content["content"],
-                        "role": str(OpenAIChatRole.TOOL_RESPONSE.value),
-                        "tool_call_id": msg_content["tool_call_id"],
-                    }
-                    input.append(tool_response)
-                else:
-                    input.append({"role": msg.role, "content": msg.content})
-        elif self.type == ModelType.EMBEDDING:
+        if self.type is ModelType.CHAT:
+            return self._format_chat_request(messages)
+        if self.type is ModelType.EMBEDDING:
             raise NotImplementedError("Embedding models are not yet supported.")
-        elif self.type == ModelType.CODE:
-            raise NotImplementedError("Code models are not yet supported.")
-        logger.debug(f"input: {json.dumps(input, indent=2)}")
+        raise NotImplementedError("Code models are not yet supported.")
+
+    def _format_chat_request(
+        self, messages: List[Notion]
+    ) -> List[ChatCompletionMessageParam]:
+        input: List[ChatCompletionMessageParam] = []
+        for msg in messages:
+            # Roles are translated here rather than in _preprocess, so that
+            # messages are only walked once.
+            name = msg.chat_role.name
+            handler = _ROLE_HANDLERS.get(name, _format_default)
+            param = handler(msg, _ROLE_TO_OPENAI[name])
+            if param is not None:
+                input.append(param)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("input: %s", json.dumps(input, indent=2))
         return input
 
     def _standardize_response(
-        self, response: Union[str, ChatCompletion, ChatCompletionChunk]
+        self,
+        response: Union[str, ChatCompletion, ChatCompletionChunk],
+        tool_calls: Optional[ToolCalls] = None,
+    ) -> List[Notion]:
+        """
+        Standardizes a response or stream chunk into a List of Notions.
+
+        If `tool_calls` is given, tool call fragments in stream chunks are
+        merged into it instead of each being returned as a Notion.
+        """
+        if self.type is ModelType.CHAT:
+            return self._standardize_chat_response(response, tool_calls)
+        if self.type is ModelType.EMBEDDING:
+            raise NotImplementedError("Embedding models are not yet supported.")
+        raise NotImplementedError("Code models are not yet supported.")
+
+    def _standardize_chat_response(
+        self,
+        response: Union[ChatCompletion, ChatCompletionChunk],
+        tool_calls: Optional[ToolCalls] = None,
     ) -> List[Notion]:
+        choices = response.choices
+        if not choices:
+            # e.g. the trailing usage chunk of a stream.
+            if response.usage is not None:
+                self._last_usage = response.usage
+            return []
+        first_choice = choices[0]
+        # Fast path for the usual stream chunk: a single delta with no tool
+        # calls, which is either plain content or empty (e.g. the final chunk).
+        if len(choices) == 1:
+            delta = getattr(first_choice, "delta", None)
+            if delta is not None and delta.tool_calls is None:
+                content = delta.content
+                if content is None:
+                    return []
+                return [Notion.model_construct(content=content, role=_NOTION_AI)]
+
         output: List[Notion] = []
-        if self.type == ModelType.CHAT:
-            if (
-                hasattr(response.choices[0], "delta")
-                and response.choices[0].delta is not None
-            ):
-                logger.debug("response is a chunk")
-                rc: ChatCompletionChunk = response
-                for choice in rc.choices:
-                    msg = choice.delta
-                    logger.debug(f"msg: {msg}")
-                    if hasattr(msg, "tool_calls") and msg.tool_calls is not None:
-                        logger.debug("msg has tool_calls")
-                        output.append(
-                            Notion(
-                                content=json.dumps(
-                                    msg.model_dump(include="tool_calls")["tool_calls"]
-                                ),
-                                role=str(ChatRole.TOOL_CALL.value),
+        if getattr(first_choice, "delta", None) is not None:
+            logger.debug("response is a chunk")
+            rc: ChatCompletionChunk = response
+            for choice in rc.choices:
+                msg = choice.delta
+                logger.debug("msg: %s", msg)
+                if msg.tool_calls is not None:
+                    logger.debug("msg has tool_calls")
+                    if tool_calls is not None:
+                        tool_calls.extend(
+                            ToolCalls.model_construct(
+                                list=[
+                                    ToolCall.model_validate(_dump_tool_call(tc))
+                                    for tc in msg.tool_calls
+                                ]
                             )
                         )
-                    else:
-                        if msg.content is not None:
-                            output.append(
-                                Notion(content=msg.content, role=str(ChatRole.AI.value))
-                            )
-            elif (
-                hasattr(response.choices[0], "message")
-                and response.choices[0].message is not None
-            ):
-                # logger.debug("response is not a chunk")
-                r: ChatCompletion = response
-                for choice in r.choices:
-                    msg = choice.message
-                    # logger.debug(f"msg: {msg}")
-                    if hasattr(msg, "tool_calls") and msg.tool_calls is not None:
-                        # logger.debug("msg has tool_calls")
+                        continue
+                    output.append(
+                        Notion.model_construct(
+                            content=json_dumps(
+                                [_dump_tool_call(tc) for tc in msg.tool_calls]
+                            ),
+                            role=_NOTION_TOOL_CALL,
+                        )
+                    )
+                else:
+                    if msg.content is not None:
                         output.append(
-                            Notion(
-                                content=json.dumps(
-                                    msg.model_dump(include="tool_calls")["tool_calls"]
-                                ),
-                                role=str(ChatRole.TOOL_CALL.value),
-                            )
+                            Notion.model_construct(content=msg.content, role=_NOTION_AI)
                         )
-                    else:
-                        if msg.content is not None:
-                            output.append(
-                                Notion(content=msg.content, role=str(ChatRole.AI.value))
-                            )
-            else:
-                raise ValueError(
-                    "Invalid response - has neither message nor delta"
-                    + "property set in choices."
-                    + "\n response.choices[0]: "
-                    + "{response.choices[0].model_dump_json(exclude_none=True)}"
-                )
-        elif self.type == ModelType.EMBEDDING:
-            raise NotImplementedError("Embedding models are not yet supported.")
-        elif self.type == ModelType.CODE:
-            raise NotImplementedError("Code models are not yet supported.")
+        elif getattr(first_choice, "message", None) is not None:
+            # logger.debug("response is not a chunk")
+            r: ChatCompletion = response
+            if r.usage is not None:
+                self._last_usage = r.usage
+            for choice in r.choices:
+                msg = choice.message
+                # logger.debug("msg: %s", msg)
+                if msg.tool_calls is not None:
+                    # logger.debug("msg has tool_calls")
+                    output.append(
+                        Notion.model_construct(
+                            content=json_dumps(
+                                [_dump_tool_call(tc) for tc in msg.tool_calls]
+                            ),
+                            role=_NOTION_TOOL_CALL,
+                        )
+                    )
+                else:
+                    if msg.content is not None:
+                        output.append(
+                            Notion.model_construct(content=msg.content, role=_NOTION_AI)
+                        )
+        else:
+            raise ValueError(
+                "Invalid response - has neither message nor delta "
+                + "property set in choices."
+                + f"\n response.choices[0]: {first_choice!r}"
+            )
         return output
 
+    @staticmethod
+    def _tool_call_notions(tool_calls: ToolCalls) -> List[Notion]:
+        """
+        The Notions for tool calls assembled from a stream, if there are any.
+        """
+        if not tool_calls.list:
+            return []
+        return [
+            Notion.model_construct(content=tool_calls.to_json(), role=_NOTION_TOOL_CALL)
+        ]
+
     def _postprocess(self, response: List[Notion]) -> List[Notion]:
         return response
 
-    def _retry_call(
-        self,
-        input: List[ChatCompletionMessageParam],
-        e: Exception,
-        api_call: Callable,
-        retries: int = 0,
-    ):
+    @staticmethod
+    def _cache_key(input: List[ChatCompletionMessageParam], kwargs: dict) -> str:
+        """
+        A stable key for a request, covering the messages and call parameters.
+        """
+        payload = json.dumps([input, kwargs], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _is_cacheable(response: Any) -> bool:
+        """
+        Whether a response can be reused for an identical request.
+
+        Tool call responses depend on tool results, so they're left out.
+        """
+        choices = getattr(response, "choices", None)
+        if not choices:
+            return False
+        return all(
+            getattr(choice, "message", None) is not None
+            and not choice.message.tool_calls
+            for choice in choices
+        )
+
+    def _cache_get(self, key: str) -> Optional[ChatCompletion]:
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        return ChatCompletion.model_validate(cached)
+
+    def _cache_put(self, key: str, response: Any) -> None:
+        # Store plain data so that any mapping (e.g. a shelf) can back the cache.
+        if self._is_cacheable(response):
+            self.cache[key] = response.model_dump()
+
+    def _call(
+        self, input: List[ChatCompletionMessageParam], retries: int = 0, **kwargs
+    ) -> ChatCompletion:
+        if self.cache is None or kwargs.get("stream"):
+            return super()._call(input, retries, **kwargs)
+
+        key = self._cache_key(input, kwargs)
+        response = self._cache_get(key)
+        if response is None:
+            response = super()._call(input, retries, **kwargs)
+            self._cache_put(key, response)
+        return response
+
+    async def _acall(
+        self, input: List[ChatCompletionMessageParam], retries: int = 0, **kwargs
+    ) -> ChatCompletion:
+        if self.cache is None or kwargs.get("stream"):
+            return await super()._acall(input, retries, **kwargs)
+
+        key = self._cache_key(input, kwargs)
+        response = self._cache_get(key)
+        if response is None:
+            response = await super()._acall(input, retries, **kwargs)
+            self._cache_put(key, response)
+        return response
+
+    def _prepare_retry_input(
+        self, input: List[ChatCompletionMessageParam], e: Exception
+    ) -> List[ChatCompletionMessageParam]:
         if not isinstance(input, list):
             raise ValueError("Input must be a list of ChatCompletionMessageParam.")
 
@@ -253,35 +634,44 @@ class OpenAIModel(Model):
                 + "Only chat and embedding models are supported."
             )
 
-        inp = input.copy()
         # Remove everything since the last user message
-        for i in range(len(inp) - 1, -1, -1):
-            if inp[i]["role"] == str(OpenAIChatRole.HUMAN.value):
-                inp = inp[: i + 1]
-                break
+        last_human = next(
+            (
+                len(input) - i
+                for i, msg in enumerate(reversed(input))
+                if msg["role"] == _ROLE_HUMAN
+            ),
+            None,
+        )
+        inp = input[:last_human] if last_human is not None else input.copy()
         # Inform the AI
         inp.append(
             {
-                "role": str(OpenAIChatRole.SYSTEM.value),
+                "role": _ROLE_SYSTEM,
                 "content": f"Error calling OpenAI chat completion API: {e}. "
                 + "Do not try to repeat the last action.",
             }
         )
-        # Try again
-        retries += 1
-        return self._common_call_logic(inp, api_call, retries)
+        return inp
 
     def generate(
         self,
         messages: Messages,
         create_params: CompletionCreateParamsNonStreaming = None,
     ):
-        create_params = create_params or {}
+        """
+        Args:
+            messages (Messages): The messages to respond to.
+            create_params (CompletionCreateParamsNonStreaming, optional):
+                Parameters for this call, merged with `completion_params`.
+                Pass e.g. `{"n": 3}` to get several completions in one
+                request; each choice becomes a Notion in the returned list.
+                To respond to several conversations, use `abatch` instead.
+        """
         return self._common_generate_logic(
             messages,
             False,
-            **create_params,
-            **self.__chat_args,
+            **self.__chat_args(create_params),
         )
 
     async def agenerate(
@@ -289,55 +679,207 @@ class OpenAIModel(Model):
         messages: Messages,
         create_params: CompletionCreateParamsNonStreaming = None,
     ):
-        create_params = create_params or {}
+        """
+        Args:
+            messages (Messages): The messages to respond to.
+            create_params (CompletionCreateParamsNonStreaming, optional):
+                Parameters for this call, merged with `completion_params`.
+                Pass e.g. `{"n": 3}` to get several completions in one
+                request; each choice becomes a Notion in the returned list.
+                To respond to several conversations, use `abatch` instead.
+        """
         return await self._common_generate_logic(
             messages,
             True,
-            **create_params,
-            **self.__chat_args,
+            **self.__chat_args(create_params),
+        )
+
+    def submit_batch(
+        self,
+        messages_list: List[Messages],
+        create_params: CompletionCreateParamsNonStreaming = None,
+    ) -> str:
+        """
+        Submits several conversations to the OpenAI Batch API, which responds
+        within 24 hours at a lower price than regular requests.
+
+        Args:
+            messages_list (List[Messages]): The conversations to respond to.
+            create_params (CompletionCreateParamsNonStreaming, optional):
+                Parameters for every request, merged with `completion_params`.
+
+        Returns:
+            str: The id of the batch, to pass to `poll_batch`.
+        """
+        if self.type is not ModelType.CHAT:
+            raise ValueError("Only chat models support batches.")
+
+        args = self.__chat_args(create_params)
+        lines = [
+            json_dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": _BATCH_ENDPOINT,
+                    "body": {**args, "messages": self._prepare_input(messages)},
+                }
+            )
+            for i, messages in enumerate(messages_list)
+        ]
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=_BATCH_ENDPOINT,
+            completion_window="24h",
         )
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[List[Optional[List[Notion]]]]:
+        """
+        Gets the responses to a batch submitted with `submit_batch`.
+
+        Args:
+            batch_id (str): The id returned by `submit_batch`.
+
+        Returns:
+            Optional[List[Optional[List[Notion]]]]: None while the batch is still
+            running. Otherwise the responses, in the order the conversations were
+            submitted, with None for any request that failed.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelling", "cancelled"):
+            raise ValueError(f"Batch {batch_id} did not complete: {batch.status}")
+        if batch.status != "completed":
+            return None
+
+        total = batch.request_counts.total if batch.request_counts else 0
+        results: List[Optional[List[Notion]]] = [None] * total
+        if batch.output_file_id is None:
+            return results
+
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line:
+                continue
+            result = json_loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            completion = ChatCompletion.model_validate(response["body"])
+            results[int(result["custom_id"])] = self._postprocess(
+                self._standardize_chat_response(completion)
+            )
+        return results
 
     def stream(
         self,
         messages: Messages,
         create_params: CompletionCreateParams = None,
+        flush_interval: Optional[float] = None,
+        flush_every_n_chars: Optional[int] = None,
     ):
-        create_params = create_params or {}
-
+        """
+        Args:
+            messages (Messages): The messages to respond to.
+            create_params (CompletionCreateParams, optional): Parameters for this
+                call, merged with `completion_params`.
+            flush_interval (float, optional): If set, consecutive content deltas
+                are joined and yielded with the first delta to arrive at least
+                `flush_interval` seconds after the last yield. This is checked
+                per delta rather than on a timer, so if the stream stalls, the
+                joined content waits for the next delta or the end of the stream.
+            flush_every_n_chars (int, optional): If set, consecutive content
+                deltas are joined and yielded once at least this many characters
+                are buffered. Can be combined with `flush_interval`.
+                If neither is set, every delta is yielded as it arrives.
+        """
         input = self._common_stream_logic(messages)
         output_stream: Stream[ChatCompletionChunk] = self._call(
-            input, **{**create_params, **self.__chat_args, "stream": True}
+            input, **self.__chat_args(create_params, stream=True)
         )
 
-        # logger.debug(f"output_stream: {output_stream}")
+        # Tool calls arrive as argument fragments, so assemble them here and
+        # emit a single Notion once the stream ends.
+        tool_calls = ToolCalls()
+        buffer = (
+            _NotionBuffer(flush_interval, flush_every_n_chars)
+            if flush_interval is not None or flush_every_n_chars is not None
+            else None
+        )
+        # Only chat models can stream, so skip the per-chunk type dispatch.
+        standardize = self._standardize_chat_response
         for chunk in output_stream:
-            # logger.debug(f"chunk: {chunk}")
-            standardized_response = self._postprocess(self._standardize_response(chunk))
+            standardized_response = self._postprocess(standardize(chunk, tool_calls))
+            if buffer is None:
+                yield from standardized_response
+                continue
             for notion in standardized_response:
-                yield notion
+                yield from buffer.add(notion)
+
+        if buffer is not None:
+            yield from buffer.flush()
+        yield from self._postprocess(self._tool_call_notions(tool_calls))
 
     async def astream(
         self,
         messages: Messages,
         create_params: CompletionCreateParams = None,
+        flush_interval: Optional[float] = None,
+        flush_every_n_chars: Optional[int] = None,
     ):
-        create_params = create_params or {}
-
+        """
+        Args:
+            messages (Messages): The messages to respond to.
+            create_params (CompletionCreateParams, optional): Parameters for this
+                call, merged with `completion_params`.
+            flush_interval (float, optional): If set, consecutive content deltas
+                are joined and yielded with the first delta to arrive at least
+                `flush_interval` seconds after the last yield. This is checked
+                per delta rather than on a timer, so if the stream stalls, the
+                joined content waits for the next delta or the end of the stream.
+            flush_every_n_chars (int, optional): If set, consecutive content
+                deltas are joined and yielded once at least this many characters
+                are buffered. Can be combined with `flush_interval`.
+                If neither is set, every delta is yielded as it arrives.
+        """
         input = self._common_stream_logic(messages)
         output_stream: AsyncStream[ChatCompletionChunk] = await self._acall(
-            input, **{**create_params, **self.__chat_args, "stream": True}
+            input, **self.__chat_args(create_params, stream=True)
         )
 
+        tool_calls = ToolCalls()
+        buffer = (
+            _NotionBuffer(flush_interval, flush_every_n_chars)
+            if flush_interval is not None or flush_every_n_chars is not None
+            else None
+        )
+        # Only chat models can stream, so skip the per-chunk type dispatch.
+        standardize = self._standardize_chat_response
         async for chunk in output_stream:
-            standardized_response = self._postprocess(self._standardize_response(chunk))
+            standardized_response = self._postprocess(standardize(chunk, tool_calls))
+            if buffer is None:
+                for notion in standardized_response:
+                    yield notion
+                continue
             for notion in standardized_response:
-                yield notion
+                for buffered in buffer.add(notion):
+                    yield buffered
+
+        if buffer is not None:
+            for buffered in buffer.flush():
+                yield buffered
+        for notion in self._postprocess(self._tool_call_notions(tool_calls)):
+            yield notion
 
     def __init__(
         self,
         name: OpenAIModelName,
         api_key: Optional[str] = None,
         completion_params: Optional[CompletionParams] = None,
+        cache: Optional[MutableMapping] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Creates a new OpenAI model.
@@ -350,20 +892,28 @@ class OpenAIModel(Model):
             completion_params (CompletionParams, optional): Parameters used when calling
                 the OpenAI completions API.
                 If None, default values will be used.
+            cache (MutableMapping, optional): A mapping used to cache responses to
+                identical non-streamed requests, e.g. a `ResponseCache` (see
+                `silverlingua.util`) or a plain `dict`.
+                If None, responses are not cached.
+            http_client (httpx.AsyncClient, optional): The HTTP client used for
+                async requests, e.g. one with a custom transport or larger
+                connection pool for heavy `agenerate`/`astream` fan-out.
+                If None, a client is shared by every model using the same API key.
         """
         completion_params = completion_params or CompletionParams()
-        tokenizer = tiktoken.encoding_for_model(name)
         args = {
             "name": name,
             "api_key": api_key or os.getenv("OPENAI_API_KEY"),
             "completion_params": completion_params,
+            "cache": cache,
             "client": None,
             "client_async": None,
             "llm": None,
             "llm_async": None,
             "can_stream": None,
             "type": None,
-            "tokenizer": Tokenizer(encode=tokenizer.encode, decode=tokenizer.decode),
+            "tokenizer": _get_tokenizer(name),
         }
 
         if args["api_key"] is None:
@@ -375,15 +925,20 @@ class OpenAIModel(Model):
         if completion_params.max_tokens is not None:
             args["max_response"] = completion_params.max_tokens
 
-        args["client"] = OpenAI(api_key=args["api_key"])
-        args["client_async"] = AsyncOpenAI(api_key=args["api_key"])
+        args["client"] = _get_client(args["api_key"])
+        if http_client is not None:
+            args["client_async"] = AsyncOpenAI(
+                api_key=args["api_key"], http_client=http_client
+            )
+        else:
+            args["client_async"] = _get_async_client(args["api_key"])
 
-        if args["name"] == "text-embedding-ada-002":
+        if args["name"] in OpenAIEmbeddingModels:
             args["can_stream"] = False
             args["llm"] = args["client"].embeddings.create
             args["llm_async"] = args["client_async"].embeddings.create
             args["type"] = ModelType.EMBEDDING
-        elif args["name"].lower().find("gpt") != -1:
+        elif args["name"] in OpenAIChatModels:
             args["can_stream"] = True
             args["llm"] = args["client"].chat.completions.create
             args["llm_async"] = args["client_async"].chat.completions.create
@@ -394,3 +949,4 @@ class OpenAIModel(Model):
                 + "Only chat and embedding models are supported."
             )
         super().__init__(**args)
+        self._context_window = OpenAIModels[name]
@@ -1,11 +1,11 @@
-from typing import List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from openai.types.chat import (
     ChatCompletionToolChoiceOptionParam,
     ChatCompletionToolParam,
 )
 from openai.types.chat.completion_create_params import ResponseFormat
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 OpenAIChatModels = {
     "gpt-4-turbo-preview": 128000,
@@ -127,3 +127,21 @@ class CompletionParams(BaseModel):
         default=None,
         description="A unique identifier representing your end-user.",
     )
+
+    _dump: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dump = None
+
+    def dump(self) -> Dict[str, Any]:
+        """
+        The parameters that are set, as keyword arguments for the API.
+
+        The result is cached until a field is assigned, so treat it as read-only,
+        and assign fields rather than mutating them in place (e.g. `stop`).
+        """
+        if self._dump is None:
+            self._dump = self.model_dump(exclude_none=True)
+        return self._dump
@@ -94,6 +94,25 @@ def test_role_member_equality():
     assert member1 != "TEST"  # Different type
 
 
+@pytest.mark.core
+@pytest.mark.atoms
+@pytest.mark.role
+@pytest.mark.unit
+def test_role_member_subclass_equality():
+    """Test RoleMember subclasses compare equal to members with the same name."""
+
+    class CustomMember(RoleMember):
+        pass
+
+    parent = object()
+    member = RoleMember("TEST", "test", parent)
+    custom = CustomMember("TEST", "custom", parent)
+
+    assert custom == member
+    assert member == custom
+    assert custom != CustomMember("OTHER", "custom", parent)
+
+
 @pytest.mark.core
 @pytest.mark.atoms
 @pytest.mark.role
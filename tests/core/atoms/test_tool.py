@@ -29,6 +29,31 @@ def test_basic_tool_creation():
     assert "Multiply a number by 2" in tool_instance.description.description
 
 
+@pytest.mark.core
+@pytest.mark.atoms
+@pytest.mark.tool
+@pytest.mark.unit
+def test_tool_description_cached():
+    """Test that Tools wrapping the same function don't share a schema."""
+
+    def sample_function(x: int) -> int:
+        """Multiply a number by 2."""
+        return x * 2
+
+    first = Tool(function=sample_function)
+    second = Tool(function=sample_function)
+    assert first.description == second.description
+    assert first.description is not second.description
+
+    serialized = str(second)
+    first.description.description = "Changed."
+    first.description.parameters.properties["x"].description = "Changed."
+    assert second.description.description == "Multiply a number by 2."
+    assert second.description.parameters.properties["x"].description == ""
+    assert str(second) == serialized
+    assert Tool(function=sample_function).description == second.description
+
+
 @pytest.mark.core
 @pytest.mark.atoms
 @pytest.mark.tool
@@ -355,3 +380,75 @@ def test_tool_calls_ordering():
     assert len(merged.list) == 3
     assert [call.index for call in merged.list] == [0, 1, 2]
     assert [call.function.name for call in merged.list] == ["test1", "test2", "test3"]
+
+
+@pytest.mark.core
+@pytest.mark.atoms
+@pytest.mark.tool
+@pytest.mark.unit
+def test_tool_calls_concat_matching():
+    """Test that ToolCalls merges by id or index, but never on a missing index."""
+    call1 = ToolCall(id="call_1", function=ToolCallFunction(name="test1"))
+    call2 = ToolCall(id="call_2", function=ToolCallFunction(name="test2"))
+
+    merged = ToolCalls(list=[call1]).concat(ToolCalls(list=[call2]))
+    assert [call.id for call in merged.list] == ["call_1", "call_2"]
+
+    # Stream chunks after the first carry no id, only the index
+    first = ToolCall(id="call_3", index=0, function=ToolCallFunction(name="test3"))
+    chunk = ToolCall(index=0, function=ToolCallFunction(arguments="{}"))
+
+    merged = ToolCalls(list=[first]).concat(ToolCalls(list=[chunk]))
+    assert len(merged.list) == 1
+    assert merged.list[0].id == "call_3"
+    assert merged.list[0].function.arguments == "{}"
+
+
+@pytest.mark.core
+@pytest.mark.atoms
+@pytest.mark.tool
+@pytest.mark.unit
+def test_tool_calls_extend():
+    """Test that ToolCalls.extend accumulates stream chunks in place."""
+    tool_calls = ToolCalls(
+        list=[ToolCall(id="call_1", index=0, function=ToolCallFunction(name="test"))]
+    )
+    inner = tool_calls.list
+    for chunk in ['{"x"', ": 1}"]:
+        tool_calls.extend(
+            ToolCalls(
+                list=[ToolCall(index=0, function=ToolCallFunction(arguments=chunk))]
+            )
+        )
+    tool_calls.extend(
+        ToolCalls(list=[ToolCall(id="call_2", index=1, function=ToolCallFunction())])
+    )
+
+    assert tool_calls.list is inner
+    assert [call.id for call in tool_calls.list] == ["call_1", "call_2"]
+    assert tool_calls.list[0].function.arguments == '{"x": 1}'
+
+
+@pytest.mark.core
+@pytest.mark.atoms
+@pytest.mark.tool
+@pytest.mark.unit
+def test_tool_calls_from_json():
+    """Test parsing and serializing a bare JSON array of tool calls."""
+    tool_calls = ToolCalls.from_json(
+        '[{"id": "call_1", "type": "function", '
+        '"function": {"name": "test", "arguments": null}}]'
+    )
+    assert len(tool_calls.list) == 1
+    assert tool_calls.list[0].id == "call_1"
+    assert tool_calls.list[0].function.arguments == ""
+    assert json.loads(tool_calls.to_json()) == [
+        {
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "test", "arguments": ""},
+        }
+    ]
+
+    with pytest.raises(ValueError):
+        ToolCalls.from_json("[not valid json]")
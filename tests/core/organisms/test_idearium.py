@@ -122,6 +122,24 @@ def test_idearium_persistent_notions(tokenizer):
     assert idearium[0] == persistent
 
 
+@pytest.mark.core
+@pytest.mark.organisms
+@pytest.mark.idearium
+@pytest.mark.unit
+def test_idearium_trim_multiple(tokenizer):
+    """Test trimming removes as many old notions as needed in one go."""
+    idearium = Idearium(tokenizer=tokenizer, max_tokens=10)
+    idearium.append(Notion(content="SYS", role=ChatRole.SYSTEM, persistent=True))
+    idearium.append(Notion(content="aaaa", role=ChatRole.HUMAN))
+    idearium.append(Notion(content="bb", role=ChatRole.AI))
+
+    # Needs both non-persistent notions removed to fit
+    idearium.append(Notion(content="cccccc", role=ChatRole.HUMAN))
+    assert [n.content for n in idearium] == ["SYS", "cccccc"]
+    assert idearium.persistent_indices == {0}
+    assert idearium.total_tokens == 9
+
+
 @pytest.mark.core
 @pytest.mark.organisms
 @pytest.mark.idearium
@@ -209,3 +227,37 @@ def test_idearium_validation(tokenizer):
     with pytest.raises(ValueError):
         idearium = Idearium(tokenizer=tokenizer, max_tokens=5)
         idearium.append(Notion(content="123456", role=ChatRole.SYSTEM, persistent=True))
+
+
+@pytest.mark.core
+@pytest.mark.organisms
+@pytest.mark.idearium
+@pytest.mark.unit
+def test_idearium_from_list(tokenizer):
+    """Test that from_list only tokenizes notions not shared with the prior."""
+    encoded = []
+    encode = tokenizer.encode
+
+    def counting_encode(text: str) -> list[int]:
+        encoded.append(text)
+        return encode(text)
+
+    counting_tokenizer = Tokenizer(encode=counting_encode, decode=tokenizer.decode)
+    notions = [
+        Notion(content="Hello", role=ChatRole.HUMAN),
+        Notion(content="Hi", role=ChatRole.AI),
+    ]
+    prior = Idearium.from_list(counting_tokenizer, 20, notions)
+    assert encoded == ["Hello", "Hi"]
+
+    encoded.clear()
+    notions = notions + [Notion(content="Bye", role=ChatRole.HUMAN)]
+    idearium = Idearium.from_list(counting_tokenizer, 20, notions, prior=prior)
+    assert encoded == ["Bye"]
+    assert len(idearium) == 3
+    assert idearium.total_tokens == 10  # "Hello" (5) + "Hi" (2) + "Bye" (3)
+
+    # A copy keeps the same notions and tokens
+    copied = idearium.copy()
+    assert copied == idearium
+    assert copied.total_tokens == idearium.total_tokens
@@ -67,6 +67,76 @@ def test_agent_find_tool(agent):
     assert tool.name == "mock_tool_function"
 
 
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.agent
+@pytest.mark.unit
+def test_agent_find_tool_after_changes(agent):
+    """Test that tool lookups follow added and removed tools."""
+
+    def other_tool_function(x: int) -> int:
+        """A simple tool that triples a number."""
+        return x * 3
+
+    assert agent._find_tool("other_tool_function") is None
+    agent.add_tool(Tool(function=other_tool_function))
+    assert agent._find_tool("other_tool_function") is not None
+
+    agent.remove_tool("mock_tool_function")
+    assert agent._find_tool("mock_tool_function") is None
+    assert agent._find_tool("other_tool_function") is not None
+
+
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.agent
+@pytest.mark.unit
+def test_agent_find_tool_after_direct_changes(agent, mock_tool):
+    """Test that tool lookups follow changes made to `tools` directly."""
+
+    def other_tool_function(x: int) -> int:
+        """A simple tool that triples a number."""
+        return x * 3
+
+    def third_tool_function(x: int) -> int:
+        """A simple tool that quadruples a number."""
+        return x * 4
+
+    other_tool = Tool(function=other_tool_function)
+    agent.tools.append(other_tool)
+    assert agent._find_tool("other_tool_function") is other_tool
+
+    agent.tools.remove(mock_tool)
+    assert agent._find_tool("mock_tool_function") is None
+
+    third_tool = Tool(function=third_tool_function)
+    agent.tools[0] = third_tool
+    assert agent._find_tool("third_tool_function") is third_tool
+    assert agent._find_tool("other_tool_function") is None
+
+
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.agent
+@pytest.mark.unit
+def test_agent_find_tool_after_replacing_tool(agent, mock_tool):
+    """Test that replacing a tool in place drops the old one from lookups."""
+
+    def other_tool_function(x: int) -> int:
+        """A simple tool that triples a number."""
+        return x * 3
+
+    other_tool = Tool(function=other_tool_function)
+    agent.tools[0] = other_tool
+    assert len(agent.tools) == 1
+    assert agent._find_tool("mock_tool_function") is None
+    assert agent._find_tool("other_tool_function") is other_tool
+
+    agent.tools[:] = [mock_tool]
+    assert agent._find_tool("mock_tool_function") is mock_tool
+    assert agent._find_tool("other_tool_function") is None
+
+
 @pytest.mark.core
 @pytest.mark.templates
 @pytest.mark.agent
@@ -88,6 +158,30 @@ def test_agent_use_tools(agent):
     assert results[0].role == "TOOL_RESPONSE"
 
 
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.agent
+@pytest.mark.unit
+async def test_agent_ause_tools(agent):
+    """Test that async tool usage keeps the order of the tool calls."""
+    tool_calls = ToolCalls(
+        list=[
+            ToolCall(
+                id=f"call_{x}",
+                function=ToolCallFunction(
+                    name="mock_tool_function", arguments=json.dumps({"x": x})
+                ),
+            )
+            for x in range(8)
+        ]
+    )
+    results = await agent._ause_tools(tool_calls)
+    assert [json.loads(n.content)["content"] for n in results] == [
+        json.dumps(x * 2) for x in range(8)
+    ]
+    assert all(n.role == "TOOL_RESPONSE" for n in results)
+
+
 @pytest.mark.core
 @pytest.mark.templates
 @pytest.mark.agent
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Generator, List, Union
 
 import pytest
@@ -68,15 +69,11 @@ class MockModel(Model):
         """No post-processing needed for mock."""
         return response
 
-    def _retry_call(
-        self,
-        input: Union[str, dict, List[any]],
-        e: Exception,
-        api_call: callable,
-        retries: int = 0,
-    ) -> Union[str, dict]:
-        """Mock retry logic."""
-        return {"response": "This is a retry response"}
+    def _prepare_retry_input(
+        self, input: Union[str, dict, List[any]], e: Exception
+    ) -> Union[str, dict, List[any]]:
+        """Mock retry logic, marking list input as retried."""
+        return input + ["retried"] if isinstance(input, list) else input
 
     def generate(self, messages: Messages, **kwargs) -> List[Notion]:
         """Synchronous generation."""
@@ -200,19 +197,47 @@ def test_model_lifecycle(model):
 @pytest.mark.templates
 @pytest.mark.model
 @pytest.mark.unit
-def test_model_retry_logic(model):
+def test_model_retry_logic(model, monkeypatch):
     """Test model retry logic."""
+    monkeypatch.setattr("silverlingua.core.templates.model._RETRY_BASE_DELAY", 0)
+    calls = []
 
-    def failing_api_call(**kwargs):
+    def failing_api_call(messages):
+        calls.append(messages)
         raise Exception("API Error")
 
-    # Should get retry response after failure
-    response = model._common_call_logic({"test": "input"}, failing_api_call, retries=0)
-    assert response == {"response": "This is a retry response"}
+    # Should raise once the retries run out
+    with pytest.raises(Exception, match="API Error"):
+        model._common_call_logic({"test": "input"}, failing_api_call, retries=0)
+    assert len(calls) == 4
 
-    # Should raise after max retries
-    with pytest.raises(Exception):
+    # Retries already made count towards the limit
+    calls.clear()
+    with pytest.raises(Exception, match="API Error"):
         model._common_call_logic({"test": "input"}, failing_api_call, retries=3)
+    assert len(calls) == 1
+
+
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.model
+@pytest.mark.unit
+def test_model_sync_retry_backoff(model, monkeypatch):
+    """Test sync calls are retried with the prepared input, backing off."""
+    delays = []
+    monkeypatch.setattr("silverlingua.core.templates.model.time.sleep", delays.append)
+    calls = []
+
+    def flaky_api_call(messages):
+        calls.append(messages)
+        if len(calls) < 3:
+            raise Exception("API Error")
+        return {"response": "ok"}
+
+    response = model._common_call_logic(["hi"], flaky_api_call)
+    assert response == {"response": "ok"}
+    assert calls == [["hi"], ["hi", "retried"], ["hi", "retried", "retried"]]
+    assert delays == [0.5, 1.0]
 
 
 def test_model_role_conversion(model):
@@ -226,6 +251,32 @@ def test_model_role_conversion(model):
     assert system_role == str(ChatRole.SYSTEM.value)
 
 
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.model
+@pytest.mark.unit
+async def test_model_async_retry_logic(model, monkeypatch):
+    """Test async calls are retried with the prepared input."""
+    monkeypatch.setattr("silverlingua.core.templates.model._RETRY_BASE_DELAY", 0)
+    calls = []
+
+    async def flaky_api_call(messages):
+        calls.append(messages)
+        if len(calls) == 1:
+            raise Exception("API Error")
+        return {"response": "ok"}
+
+    response = await model._acommon_call_logic(["hi"], flaky_api_call)
+    assert response == {"response": "ok"}
+    assert calls == [["hi"], ["hi", "retried"]]
+
+    async def failing_api_call(**_kwargs):
+        raise Exception("API Error")
+
+    with pytest.raises(Exception, match="API Error"):
+        await model._acommon_call_logic(["hi"], failing_api_call)
+
+
 @pytest.mark.asyncio
 async def test_model_async_call(model):
     """Test asynchronous model call."""
@@ -233,3 +284,64 @@ async def test_model_async_call(model):
     response = await model._acall(request)
     assert isinstance(response, dict)
     assert response["response"] == "This is a mock async response"
+
+
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.model
+@pytest.mark.unit
+async def test_model_abatch(model, monkeypatch):
+    """Test batched generation keeps order and bounds concurrency."""
+    in_flight = 0
+    peak = 0
+
+    async def agenerate(_self, messages, **_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [Notion(content=f"re: {messages}", role=ChatRole.AI)]
+
+    monkeypatch.setattr(MockModel, "agenerate", agenerate)
+
+    prompts = [f"prompt {i}" for i in range(6)]
+    results = await model.abatch(prompts, max_concurrency=2)
+
+    assert [r[0].content for r in results] == [f"re: {p}" for p in prompts]
+    assert peak == 2
+
+    with pytest.raises(ValueError):
+        await model.abatch(prompts, max_concurrency=0)
+
+
+@pytest.mark.core
+@pytest.mark.templates
+@pytest.mark.model
+@pytest.mark.unit
+async def test_model_abatch_rate_limit_and_exceptions(model, monkeypatch):
+    """Test batched generation spaces out requests and can return failures."""
+    starts = []
+
+    async def agenerate(_self, messages, **_kwargs):
+        starts.append(asyncio.get_running_loop().time())
+        if messages == "bad":
+            raise RuntimeError("boom")
+        return [Notion(content=f"re: {messages}", role=ChatRole.AI)]
+
+    monkeypatch.setattr(MockModel, "agenerate", agenerate)
+
+    results = await model.abatch(
+        ["a", "bad", "c"], requests_per_minute=3000, return_exceptions=True
+    )
+
+    assert results[0][0].content == "re: a"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2][0].content == "re: c"
+    # 3000 requests per minute is one every 20ms.
+    assert starts[2] - starts[0] >= 0.035
+
+    with pytest.raises(RuntimeError):
+        await model.abatch(["bad"])
+    with pytest.raises(ValueError):
+        await model.abatch(["a"], requests_per_minute=0)
@@ -0,0 +1,500 @@
+import json
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("openai")
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from silverlingua.core.atoms import ChatRole
+from silverlingua.core.molecules import Notion
+from silverlingua.core.organisms import Idearium
+
+from silverlingua_openai.templates.model import OpenAIModel
+from silverlingua_openai.templates.model import openai as openai_model
+
+
+class StubEncoding:
+    """Stands in for a tiktoken encoding, one token per character."""
+
+    def encode(self, text: str) -> List[int]:
+        return [ord(c) for c in text]
+
+    def decode(self, tokens: List[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture
+def stub_encoding(monkeypatch):
+    """Keeps the tests offline, as tiktoken downloads its encodings."""
+    openai_model._get_tokenizer.cache_clear()
+    monkeypatch.setattr(openai_model, "_get_encoding", lambda _name: StubEncoding())
+    yield
+    openai_model._get_tokenizer.cache_clear()
+
+
+@pytest.fixture
+def model(stub_encoding) -> OpenAIModel:  # noqa: ARG001
+    return OpenAIModel("gpt-4", api_key="test-key")
+
+
+def completion(content: str) -> dict:
+    """A chat completion response body with a single message."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+    }
+
+
+class StubBatchClient:
+    """Records Batch API calls made through `files` and `batches`."""
+
+    def __init__(
+        self,
+        status: str = "completed",
+        total: int = 0,
+        output: Optional[str] = None,
+    ):
+        self.uploaded: Optional[bytes] = None
+        self.batch_args: Optional[dict] = None
+        self.status = status
+        self.total = total
+        self.output = output
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve
+        )
+
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = file[1]
+        return SimpleNamespace(id="file-in")
+
+    def _content(self, file_id):
+        assert file_id == "file-out"
+        return SimpleNamespace(text=self.output)
+
+    def _create_batch(self, **kwargs):
+        self.batch_args = kwargs
+        return SimpleNamespace(id="batch-1")
+
+    def _retrieve(self, batch_id):
+        assert batch_id == "batch-1"
+        return SimpleNamespace(
+            status=self.status,
+            request_counts=SimpleNamespace(total=self.total),
+            output_file_id="file-out" if self.output is not None else None,
+        )
+
+
+def chunk(delta: dict) -> ChatCompletionChunk:
+    """A stream chunk with a single delta."""
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        }
+    )
+
+
+def tool_call_delta(
+    index: int, arguments: str, name: Optional[str] = None, **fields
+) -> dict:
+    """A delta holding one tool call fragment."""
+    function = {"arguments": arguments}
+    if name is not None:
+        function["name"] = name
+    return {"tool_calls": [{"index": index, "function": function, **fields}]}
+
+
+def stream_model(model: OpenAIModel, chunks: List[ChatCompletionChunk]) -> OpenAIModel:
+    """`model` with its llm stubbed to stream `chunks`."""
+
+    def llm(**kwargs):
+        assert kwargs["stream"] is True
+        return iter(chunks)
+
+    async def llm_async(**kwargs):
+        assert kwargs["stream"] is True
+
+        async def stream():
+            for c in chunks:
+                yield c
+
+        return stream()
+
+    return model.model_copy(update={"llm": llm, "llm_async": llm_async})
+
+
+def batch_model(model: OpenAIModel, client: StubBatchClient) -> OpenAIModel:
+    return model.model_copy(update={"client": client})
+
+
+@pytest.mark.openai
+@pytest.mark.tokenizer
+@pytest.mark.unit
+def test_streamed_appends_do_not_fill_encode_cache(model):
+    """Test the growing content of a streamed response isn't cached whole."""
+    tokenizer = model.tokenizer
+    idearium = Idearium(tokenizer, max_tokens=100_000)
+    chunk = "word "
+    for _ in range(1000):
+        idearium.append(Notion(content=chunk, role="assistant"))
+
+    assert idearium[0].content == chunk * 1000
+    assert tokenizer.encode(idearium[0].content) == idearium.tokenized_notions[0]
+    # Only the prefixes short enough to cache are, not one per chunk.
+    cached = tokenizer.encode.cache_info().currsize
+    assert cached <= openai_model._ENCODE_CACHE_MAX_CHARS // len(chunk) + 1
+    assert cached < openai_model._ENCODE_CACHE_SIZE
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+def test_submit_batch_request_lines(model):
+    """Test each conversation becomes one JSONL request, in order."""
+    client = StubBatchClient()
+    batch_id = batch_model(model, client).submit_batch(
+        ["Hello", "Goodbye"], create_params={"seed": 7}
+    )
+
+    assert batch_id == "batch-1"
+    assert client.batch_args == {
+        "input_file_id": "file-in",
+        "endpoint": "/v1/chat/completions",
+        "completion_window": "24h",
+    }
+    lines = [json.loads(line) for line in client.uploaded.decode().splitlines()]
+    assert [line["custom_id"] for line in lines] == ["0", "1"]
+    for line, content in zip(lines, ["Hello", "Goodbye"], strict=True):
+        assert line["method"] == "POST"
+        assert line["url"] == "/v1/chat/completions"
+        body = line["body"]
+        assert body["model"] == "gpt-4"
+        assert body["seed"] == 7
+        assert "stream" not in body
+        assert body["messages"] == [{"role": "user", "content": content}]
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+def test_poll_batch_orders_results_by_custom_id(model):
+    """Test results are put back in submission order, with None for failures."""
+    results = [
+        {
+            "custom_id": "2",
+            "response": {"status_code": 200, "body": completion("third")},
+        },
+        {
+            "custom_id": "1",
+            "response": {"status_code": 500, "body": {"error": "server error"}},
+        },
+        {
+            "custom_id": "0",
+            "response": {"status_code": 200, "body": completion("first")},
+        },
+        {"custom_id": "3", "response": None, "error": {"code": "invalid"}},
+    ]
+    output = "\n".join(json.dumps(result) for result in results) + "\n"
+    client = StubBatchClient(total=4, output=output)
+
+    responses = batch_model(model, client).poll_batch("batch-1")
+
+    assert len(responses) == 4
+    assert [n.content for n in responses[0]] == ["first"]
+    assert responses[1] is None
+    assert [n.content for n in responses[2]] == ["third"]
+    assert responses[3] is None
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+@pytest.mark.parametrize("status", ["validating", "in_progress", "finalizing"])
+def test_poll_batch_running(model, status):
+    """Test None is returned while the batch is still running."""
+    client = StubBatchClient(status=status, total=2)
+    assert batch_model(model, client).poll_batch("batch-1") is None
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+@pytest.mark.parametrize("status", ["failed", "expired", "cancelling", "cancelled"])
+def test_poll_batch_not_completed(model, status):
+    """Test a batch that won't complete raises."""
+    client = StubBatchClient(status=status, total=2)
+    with pytest.raises(ValueError, match=status):
+        batch_model(model, client).poll_batch("batch-1")
+
+
+def interleaved_tool_call_chunks() -> List[ChatCompletionChunk]:
+    return [
+        chunk({"role": "assistant", "content": None}),
+        chunk(tool_call_delta(0, "", "double", id="call_a", type="function")),
+        chunk(tool_call_delta(0, '{"x"')),
+        chunk(tool_call_delta(1, "", "reverse", id="call_b", type="function")),
+        chunk(tool_call_delta(1, '{"text": ')),
+        chunk(tool_call_delta(0, ": 42}")),
+        chunk(tool_call_delta(1, '"hello"}')),
+        chunk({}),
+    ]
+
+
+def assert_single_tool_call_notion(notions: List[Notion]):
+    assert len(notions) == 1
+    notion = notions[0]
+    assert notion.chat_role == ChatRole.TOOL_CALL
+    tool_calls = json.loads(notion.content)
+    assert [tc["id"] for tc in tool_calls] == ["call_a", "call_b"]
+    assert [tc["function"]["name"] for tc in tool_calls] == ["double", "reverse"]
+    assert [json.loads(tc["function"]["arguments"]) for tc in tool_calls] == [
+        {"x": 42},
+        {"text": "hello"},
+    ]
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.streaming
+@pytest.mark.unit
+def test_stream_assembles_tool_calls(model):
+    """Test interleaved tool call fragments become a single Notion."""
+    model = stream_model(model, interleaved_tool_call_chunks())
+    assert_single_tool_call_notion(list(model.stream("Hello")))
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.streaming
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_astream_assembles_tool_calls(model):
+    """Test interleaved tool call fragments become a single Notion."""
+    model = stream_model(model, interleaved_tool_call_chunks())
+    assert_single_tool_call_notion([n async for n in model.astream("Hello")])
+
+
+def ai(content: str) -> Notion:
+    return Notion(content=content, role=ChatRole.AI)
+
+
+@pytest.mark.openai
+@pytest.mark.streaming
+@pytest.mark.unit
+def test_notion_buffer_flushes_after_interval(monkeypatch):
+    """Test buffered content is flushed by the first delta after the interval."""
+    now = 100.0
+    monkeypatch.setattr(openai_model.time, "monotonic", lambda: now)
+    buffer = openai_model._NotionBuffer(flush_interval=1.0)
+
+    assert buffer.add(ai("a")) == []
+    now = 100.5
+    assert buffer.add(ai("b")) == []
+    # Nothing is flushed while no delta arrives, however long that is.
+    now = 105.0
+    flushed = buffer.add(ai("c"))
+    assert [n.content for n in flushed] == ["abc"]
+
+    now = 105.5
+    assert buffer.add(ai("d")) == []
+    assert [n.content for n in buffer.flush()] == ["d"]
+    assert buffer.flush() == []
+
+
+@pytest.mark.openai
+@pytest.mark.streaming
+@pytest.mark.unit
+def test_notion_buffer_flushes_before_other_notions():
+    """Test buffered content is yielded before a Notion of another role."""
+    buffer = openai_model._NotionBuffer(flush_interval=60.0)
+    tool_call = Notion(content="[]", role=ChatRole.TOOL_CALL)
+
+    assert buffer.add(ai("Hel")) == []
+    assert buffer.add(ai("lo")) == []
+    flushed = buffer.add(tool_call)
+    assert [n.content for n in flushed] == ["Hello", "[]"]
+    assert flushed[1] is tool_call
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.streaming
+@pytest.mark.unit
+def test_stream_flush_interval_final_flush(model):
+    """Test buffered content is flushed at the end, before the tool calls."""
+    chunks = [
+        chunk({"role": "assistant", "content": "Let me "}),
+        chunk({"content": "check."}),
+        *interleaved_tool_call_chunks(),
+    ]
+    notions = list(stream_model(model, chunks).stream("Hello", flush_interval=60.0))
+
+    assert len(notions) == 2
+    assert notions[0].chat_role == ChatRole.AI
+    assert notions[0].content == "Let me check."
+    assert_single_tool_call_notion(notions[1:])
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.streaming
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_stream_flush_every_n_chars(model):
+    """Test content is yielded once enough characters are buffered."""
+    deltas = ["ab", "cd", "e", "fgh", "ij", "k"]
+    chunks = [chunk({"content": delta}) for delta in deltas]
+    model = stream_model(model, chunks)
+
+    notions = list(model.stream("Hello", flush_every_n_chars=4))
+    assert [n.content for n in notions] == ["abcd", "efgh", "ijk"]
+    assert "".join(n.content for n in notions) == "".join(deltas)
+
+    notions = [n async for n in model.astream("Hello", flush_every_n_chars=4)]
+    assert [n.content for n in notions] == ["abcd", "efgh", "ijk"]
+
+
+class CountingLLM:
+    """Stands in for the completions API, counting the calls made to it."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        if kwargs.get("stream"):
+            return iter([chunk({"content": "streamed"})])
+        return self.response
+
+    async def call_async(self, **kwargs):
+        response = self(**kwargs)
+        if not kwargs.get("stream"):
+            return response
+
+        async def stream():
+            for c in response:
+                yield c
+
+        return stream()
+
+
+def cached_model(model: OpenAIModel, llm: CountingLLM, cache: dict) -> OpenAIModel:
+    return model.model_copy(
+        update={"cache": cache, "llm": llm, "llm_async": llm.call_async}
+    )
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_response_cache_hit_skips_call(model):
+    """Test an identical request is answered from the cache."""
+    llm = CountingLLM(ChatCompletion.model_validate(completion("Hi there")))
+    cache = {}
+    model = cached_model(model, llm, cache)
+
+    assert [n.content for n in model.generate("Hello")] == ["Hi there"]
+    assert llm.calls == 1
+    assert len(cache) == 1
+    assert [n.content for n in model.generate("Hello")] == ["Hi there"]
+    assert [n.content for n in await model.agenerate("Hello")] == ["Hi there"]
+    assert llm.calls == 1
+
+    model.generate("Goodbye")
+    assert llm.calls == 2
+    assert len(cache) == 2
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.streaming
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_response_cache_bypassed_when_streaming(model):
+    """Test streamed requests neither read nor fill the cache."""
+    llm = CountingLLM(ChatCompletion.model_validate(completion("Hi there")))
+    cache = {}
+    model = cached_model(model, llm, cache)
+
+    for _ in range(2):
+        assert [n.content for n in model.stream("Hello")] == ["streamed"]
+        assert [n.content async for n in model.astream("Hello")] == ["streamed"]
+    assert llm.calls == 4
+    assert cache == {}
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+def test_response_cache_skips_tool_calls(model):
+    """Test responses with tool calls are not stored."""
+    body = completion("")
+    body["choices"][0]["finish_reason"] = "tool_calls"
+    body["choices"][0]["message"] = {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": "call_a",
+                "type": "function",
+                "function": {"name": "double", "arguments": '{"x": 42}'},
+            }
+        ],
+    }
+    llm = CountingLLM(ChatCompletion.model_validate(body))
+    cache = {}
+    model = cached_model(model, llm, cache)
+
+    for _ in range(2):
+        notions = model.generate("Hello")
+        assert [n.chat_role for n in notions] == [ChatRole.TOOL_CALL]
+    assert llm.calls == 2
+    assert cache == {}
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+@pytest.mark.parametrize("content", ["[1, 2]", '["a", "b"]', "[]", "not json"])
+def test_format_tool_call_falls_back_to_content(model, content):
+    """Test TOOL_CALL content that isn't a list of tool calls is sent as is."""
+    notion = Notion(content=content, role=ChatRole.TOOL_CALL)
+    assert model._format_request([notion]) == [
+        {"role": "assistant", "content": content}
+    ]
+
+
+@pytest.mark.openai
+@pytest.mark.model
+@pytest.mark.unit
+def test_format_tool_call(model):
+    """Test TOOL_CALL content holding tool calls is sent as tool_calls."""
+    tool_calls = [
+        {
+            "id": "call_a",
+            "type": "function",
+            "function": {"name": "double", "arguments": '{"x": 42}'},
+        }
+    ]
+    notion = Notion(content=json.dumps(tool_calls), role=ChatRole.TOOL_CALL)
+    assert model._format_request([notion]) == [
+        {"role": "assistant", "tool_calls": tool_calls}
+    ]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from silverlingua import util
+from silverlingua.util import ResponseCache, json_dumps, json_loads
+
+
+@pytest.mark.unit
+def test_response_cache_lru():
+    """Test the least recently used entry is evicted first."""
+    cache = ResponseCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now the least recently used
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+    with pytest.raises(ValueError):
+        ResponseCache(maxsize=0)
+
+
+@pytest.mark.unit
+def test_response_cache_ttl(monkeypatch):
+    """Test entries expire after their ttl."""
+    now = 100.0
+    monkeypatch.setattr("silverlingua.util.time.monotonic", lambda: now)
+
+    cache = ResponseCache(ttl=10)
+    cache["a"] = 1
+    now = 109.0
+    assert cache.get("a") == 1
+    now = 110.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_json_dumps_matches_without_orjson(monkeypatch):
+    """Test the output is the same whether or not orjson is installed."""
+    payload = {"text": "héllo", "items": [1, 2.5, True, None], 1: {"nested": []}}
+    expected = '{"text":"héllo","items":[1,2.5,true,null],"1":{"nested":[]}}'
+    assert json_dumps(payload) == expected
+
+    monkeypatch.setattr(util, "orjson", None)
+    assert json_dumps(payload) == expected
+    assert json_loads(expected) == json.loads(expected)
+    with pytest.raises(json.JSONDecodeError):
+        json_loads("{")